@@ -0,0 +1,73 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compare the replay-protection window against the sorted list it replaced.
+
+Usage: python -m benchmarks.replay_window [messages]
+"""
+
+import bisect
+import sys
+import time
+
+from pyrogram.session import Session
+from pyrogram.session.internals import ReplayWindow
+
+SIZE = Session.STORED_MSG_IDS_MAX_SIZE
+
+
+def sorted_list(msg_ids):
+    stored = []
+
+    for msg_id in msg_ids:
+        if len(stored) > SIZE:
+            del stored[:SIZE // 2]
+
+        if stored:
+            if msg_id < stored[0] or msg_id in stored:
+                raise ValueError
+
+        bisect.insort(stored, msg_id)
+
+
+def replay_window(msg_ids):
+    stored = ReplayWindow(SIZE)
+
+    for msg_id in msg_ids:
+        if stored:
+            if msg_id < stored.lowest or msg_id in stored:
+                raise ValueError
+
+        stored.add(msg_id)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    now = int(time.time()) * 2 ** 32
+    msg_ids = [now + i * 4 + 1 for i in range(count)]
+
+    for func in (sorted_list, replay_window):
+        start = time.perf_counter()
+        func(msg_ids)
+        elapsed = time.perf_counter() - start
+
+        print(f"{func.__name__:>15}: {elapsed:.3f}s ({count / elapsed:,.0f} msg/s)")
+
+
+if __name__ == "__main__":
+    main()
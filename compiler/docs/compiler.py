@@ -916,6 +916,7 @@ def pyrogram_api():
             PrivacyKey
             ProfileColor
             ReplyColor
+            RequestPriority
             SentCodeType
             StoriesPrivacyRules
             UserStatus
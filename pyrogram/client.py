@@ -32,7 +32,7 @@ from importlib import import_module
 from io import StringIO, BytesIO
 from mimetypes import MimeTypes
 from pathlib import Path
-from typing import Union, List, Optional, Callable, AsyncGenerator, Type, Tuple
+from typing import Union, List, Optional, Callable, AsyncGenerator, Type, Tuple, Any
 
 import pyrogram
 from pyrogram import __version__, __license__
@@ -40,17 +40,18 @@ from pyrogram import enums
 from pyrogram import raw
 from pyrogram import utils
 from pyrogram.crypto import aes
+from pyrogram.crypto.executor import CryptoExecutor
 from pyrogram.errors import CDNFileHashMismatch
 from pyrogram.errors import (
     SessionPasswordNeeded,
     VolumeLocNotFound, ChannelPrivate,
-    BadRequest, AuthBytesInvalid,
+    BadRequest, AuthBytesInvalid, Unauthorized,
     FloodWait, FloodPremiumWait,
     ChannelInvalid, PersistentTimestampInvalid, PersistentTimestampOutdated
 )
 from pyrogram.handlers.handler import Handler
 from pyrogram.methods import Methods
-from pyrogram.session import Auth, Session
+from pyrogram.session import Auth, Session, SessionPool, RateLimiter, FloodGate, Metrics
 from pyrogram.storage import Storage, FileStorage, MemoryStorage
 from pyrogram.types import User, TermsOfService
 from pyrogram.utils import ainput
@@ -61,7 +62,7 @@ from .dispatcher import Dispatcher
 from .file_id import FileId, FileType, ThumbnailSource
 from .mime_types import mime_types
 from .parser import Parser
-from .session.internals import MsgId
+from .session.internals import MsgId, DcOptions
 
 log = logging.getLogger(__name__)
 
@@ -210,6 +211,51 @@ class Client(Methods):
         init_connection_params (:obj:`~pyrogram.raw.base.JSONValue`, *optional*):
             Additional initConnection parameters.
             For now, only the tz_offset field is supported, for specifying timezone offset in seconds.
+
+        crypto_executor (:obj:`~pyrogram.crypto.executor.CryptoExecutor`, *optional*):
+            Pass a crypto executor to run the encryption and decryption of this client's sessions on.
+            Useful to give a client its own crypto threads, or to share a bigger pool among multiple clients.
+            Each session is pinned to one of the executor's workers.
+            Defaults to the process-wide ``pyrogram.crypto_executor`` (a single worker).
+
+        media_pool_size (``int``, *optional*):
+            Number of parallel connections opened to each DC for media transfers (uploads, downloads and inline
+            messages). Requests are routed to the connection with the fewest requests in flight.
+            Defaults to 1.
+
+        session_pool_size (``int``, *optional*):
+            Number of parallel connections opened to each DC other than the home one for regular requests (e.g.:
+            business connections). The home DC always uses a single connection, which also receives updates.
+            Defaults to 1.
+
+        hedge_requests (``bool``, *optional*):
+            Pass True to hedge read-only requests (e.g.: fetching messages, users or chat members). When no answer
+            arrives within the usual response time of the session, the request is sent once more and the first answer
+            wins, while the other one is dropped.
+            Defaults to False.
+
+        rate_limiter (:obj:`~pyrogram.session.RateLimiter`, *optional*):
+            Pass a rate limiter to pace outgoing requests within Telegram's limits, instead of sending them right away
+            and running into FloodWait errors. Excess requests are queued locally.
+            Defaults to None (no rate limiting).
+
+        gzip_requests (``bool``, *optional*):
+            Pass False to disable the compression of big requests. When enabled, requests bigger than a few hundred
+            bytes (e.g.: long messages, inline query results or contacts imports) are sent gzip-compressed whenever
+            this makes them smaller.
+            Defaults to True.
+
+        warm_standby (``bool``, *optional*):
+            Pass True to keep a second connection to the home DC (and to other DCs used for regular requests)
+            connected and initialized at all times. When the main connection drops, the session switches over to it
+            instantly instead of reconnecting from scratch.
+            Defaults to False.
+
+        metrics_callback (``Callable``, *optional*):
+            Pass a function to be notified of every metric observed by the sessions of this client (e.g.: to export
+            them to a monitoring system). It is called with the metric name (e.g.: "latency", "rtt", "bytes_sent",
+            "flood_wait"), its value and the name of the raw function involved, if any. It runs on the event loop, so it
+            must not block. Metrics can also be read at any time from :attr:`Client.metrics`.
     """
 
     APP_VERSION = f"Pyrogram {__version__}"
@@ -230,6 +276,8 @@ class Client(Methods):
     UPDATES_WATCHDOG_INTERVAL = 15 * 60
 
     MAX_CONCURRENT_TRANSMISSIONS = 1
+    MEDIA_POOL_SIZE = 1
+    SESSION_POOL_SIZE = 1
     MAX_MESSAGE_CACHE_SIZE = 10000
 
     mimetypes = MimeTypes()
@@ -270,7 +318,15 @@ class Client(Methods):
         client_platform: "enums.ClientPlatform" = enums.ClientPlatform.OTHER,
         init_connection_params: Optional["raw.base.JSONValue"] = None,
         connection_factory: Type[Connection] = Connection,
-        protocol_factory: Type[TCP] = TCPAbridged
+        protocol_factory: Type[TCP] = TCPAbridged,
+        crypto_executor: Optional[CryptoExecutor] = None,
+        media_pool_size: int = MEDIA_POOL_SIZE,
+        session_pool_size: int = SESSION_POOL_SIZE,
+        hedge_requests: Optional[bool] = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        gzip_requests: Optional[bool] = True,
+        warm_standby: Optional[bool] = False,
+        metrics_callback: Optional[Callable[[str, float, Optional[str]], Any]] = None
     ):
         super().__init__()
 
@@ -307,6 +363,20 @@ class Client(Methods):
         self.init_connection_params = init_connection_params
         self.connection_factory = connection_factory
         self.protocol_factory = protocol_factory
+        self.crypto_executor = crypto_executor or pyrogram.crypto_executor
+        self.media_pool_size = media_pool_size
+        self.session_pool_size = session_pool_size
+        self.hedge_requests = hedge_requests
+        self.rate_limiter = rate_limiter
+        self.gzip_requests = gzip_requests
+        self.warm_standby = warm_standby
+        self.metrics_callback = metrics_callback
+
+        # FloodWait errors are shared among all the sessions of this client
+        self.flood_gate = FloodGate()
+
+        # Data center endpoints learnt from the server config, shared among all the sessions of this client
+        self.dc_options = DcOptions()
 
         self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="Handler")
 
@@ -347,6 +417,9 @@ class Client(Methods):
 
         self.disconnect_handler = None
 
+        # Fire-and-forget requests still running
+        self.background_tasks = set()
+
         self.me: Optional[User] = None
 
         self.message_cache = Cache(self.max_message_cache_size)
@@ -378,6 +451,13 @@ class Client(Methods):
         except ConnectionError:
             pass
 
+    @property
+    def metrics(self) -> Metrics:
+        """Telemetry aggregated over all the sessions of this client (home DC, other DCs and media)."""
+        sessions = [self.session, *self.sessions.values(), *self.media_sessions.values()]
+
+        return Metrics.merge(session.metrics for session in sessions if session is not None)
+
     async def updates_watchdog(self):
         while True:
             try:
@@ -629,7 +709,13 @@ class Client(Methods):
 
         return is_min
 
-    async def handle_updates(self, updates):
+    async def handle_updates(self, updates, previous: Optional[asyncio.Future] = None):
+        """Store the state carried by the updates and hand them over to the dispatcher.
+
+        Missing data is requested from the server (difference requests) right away, but nothing is stored or
+        dispatched before the handling of the *previous* updates is done, so updates keep the order they were received
+        in without one slow difference request holding back the ones that follow.
+        """
         self.last_update_time = datetime.now()
 
         if isinstance(updates, (raw.types.Updates, raw.types.UpdatesCombined)):
@@ -640,6 +726,7 @@ class Client(Methods):
 
             users = {u.id: u for u in updates.users}
             chats = {c.id: c for c in updates.chats}
+            entries = []
 
             for update in updates.updates:
                 channel_id = getattr(
@@ -653,19 +740,7 @@ class Client(Methods):
                 pts = getattr(update, "pts", None)
                 pts_count = getattr(update, "pts_count", None)
 
-                if pts and not self.skip_updates:
-                    await self.storage.update_state(
-                        (
-                            utils.get_channel_id(channel_id) if channel_id else 0,
-                            pts,
-                            None,
-                            updates.date,
-                            updates.seq
-                        )
-                    )
-
-                if isinstance(update, raw.types.UpdateChannelTooLong):
-                    log.info(update)
+                entries.append((update, channel_id, pts))
 
                 if isinstance(update, raw.types.UpdateNewChannelMessage) and is_min:
                     message = update.message
@@ -693,8 +768,37 @@ class Client(Methods):
                                 users.update({u.id: u for u in diff.users})
                                 chats.update({c.id: c for c in diff.chats})
 
+            if previous is not None:
+                await asyncio.wait([previous])
+
+            for update, channel_id, pts in entries:
+                if pts and not self.skip_updates:
+                    await self.storage.update_state(
+                        (
+                            utils.get_channel_id(channel_id) if channel_id else 0,
+                            pts,
+                            None,
+                            updates.date,
+                            updates.seq
+                        )
+                    )
+
+                if isinstance(update, raw.types.UpdateChannelTooLong):
+                    log.info(update)
+
                 self.dispatcher.updates_queue.put_nowait((update, users, chats))
         elif isinstance(updates, (raw.types.UpdateShortMessage, raw.types.UpdateShortChatMessage)):
+            diff = await self.invoke(
+                raw.functions.updates.GetDifference(
+                    pts=updates.pts - updates.pts_count,
+                    date=updates.date,
+                    qts=-1
+                )
+            )
+
+            if previous is not None:
+                await asyncio.wait([previous])
+
             if not self.skip_updates:
                 await self.storage.update_state(
                     (
@@ -706,14 +810,6 @@ class Client(Methods):
                     )
                 )
 
-            diff = await self.invoke(
-                raw.functions.updates.GetDifference(
-                    pts=updates.pts - updates.pts_count,
-                    date=updates.date,
-                    qts=-1
-                )
-            )
-
             if diff.new_messages:
                 self.dispatcher.updates_queue.put_nowait((
                     raw.types.UpdateNewMessage(
@@ -728,6 +824,9 @@ class Client(Methods):
                 if diff.other_updates:  # The other_updates list can be empty
                     self.dispatcher.updates_queue.put_nowait((diff.other_updates[0], {}, {}))
         elif isinstance(updates, raw.types.UpdateShort):
+            if previous is not None:
+                await asyncio.wait([previous])
+
             self.dispatcher.updates_queue.put_nowait((updates.update, {}, {}))
         elif isinstance(updates, raw.types.UpdatesTooLong):
             log.info(updates)
@@ -1015,6 +1114,97 @@ class Client(Methods):
                 shutil.move(temp_file_path, file_path)
                 return file_path
 
+    async def start_dc_session(self, dc_id: int, is_media: bool = False, is_cdn: bool = False) -> Session:
+        """Start an authorized session on a data center other than the home one.
+
+        The auth key stored for that data center is reused when available. A new one is created (and authorized,
+        unless the data center is a CDN) only if there's none or the server rejects it.
+        """
+        test_mode = await self.storage.test_mode()
+        auth_key = await self.storage.dc_auth_key(dc_id)
+
+        if auth_key is not None:
+            session = Session(self, dc_id, auth_key, test_mode, is_media=is_media, is_cdn=is_cdn)
+
+            try:
+                await session.start()
+            except Unauthorized:
+                log.info("[%s] Stored auth key for DC%s was rejected", self.name, dc_id)
+                await self.storage.dc_auth_key(dc_id, None)
+            else:
+                if is_cdn:
+                    return session
+
+                try:
+                    await session.invoke(
+                        raw.functions.InvokeWithoutUpdates(
+                            query=raw.functions.users.GetUsers(id=[raw.types.InputUserSelf()])
+                        )
+                    )
+                except Unauthorized:
+                    # The key is still valid, only its authorization is gone
+                    await self.import_authorization(session)
+
+                return session
+
+        auth_key = await Auth(self, dc_id, test_mode).create()
+        session = Session(self, dc_id, auth_key, test_mode, is_media=is_media, is_cdn=is_cdn)
+
+        await session.start()
+
+        if not is_cdn:
+            await self.import_authorization(session)
+
+        await self.storage.dc_auth_key(dc_id, auth_key)
+
+        return session
+
+    async def start_session_pool(self, dc_id: int, is_media: bool = False) -> SessionPool:
+        """Start a pool of sessions on a DC, sized according to media_pool_size or session_pool_size."""
+        size = self.media_pool_size if is_media else self.session_pool_size
+
+        if dc_id == await self.storage.dc_id():
+            session = Session(
+                self, dc_id, await self.storage.auth_key(),
+                await self.storage.test_mode(), is_media=is_media
+            )
+            await session.start()
+        else:
+            session = await self.start_dc_session(dc_id, is_media=is_media)
+
+        # The auth key is already authorized, the other sessions can simply share it
+        pool = SessionPool([session] + [
+            Session(self, dc_id, session.auth_key, session.test_mode, is_media=is_media)
+            for _ in range(size - 1)
+        ])
+
+        await asyncio.gather(*(s.start() for s in pool.sessions[1:]))
+
+        return pool
+
+    async def import_authorization(self, session: Session):
+        for _ in range(3):
+            exported_auth = await self.invoke(
+                raw.functions.auth.ExportAuthorization(
+                    dc_id=session.dc_id
+                )
+            )
+
+            try:
+                await session.invoke(
+                    raw.functions.auth.ImportAuthorization(
+                        id=exported_auth.id,
+                        bytes=exported_auth.bytes
+                    )
+                )
+            except AuthBytesInvalid:
+                continue
+            else:
+                break
+        else:
+            await session.stop()
+            raise AuthBytesInvalid
+
     async def get_file(
         self,
         file_id: FileId,
@@ -1072,39 +1262,11 @@ class Client(Methods):
             dc_id = file_id.dc_id
 
             try:
-                session = self.media_sessions.get(dc_id)
-                if not session:
-                    session = self.media_sessions[dc_id] = Session(
-                        self, dc_id,
-                        await Auth(self, dc_id, await self.storage.test_mode()).create()
-                        if dc_id != await self.storage.dc_id()
-                        else await self.storage.auth_key(),
-                        await self.storage.test_mode(),
-                        is_media=True
-                    )
-                    await session.start()
+                async with self.media_sessions_lock:
+                    session = self.media_sessions.get(dc_id)
 
-                    if dc_id != await self.storage.dc_id():
-                        for _ in range(3):
-                            exported_auth = await self.invoke(
-                                raw.functions.auth.ExportAuthorization(
-                                    dc_id=dc_id
-                                )
-                            )
-
-                            try:
-                                await session.invoke(
-                                    raw.functions.auth.ImportAuthorization(
-                                        id=exported_auth.id,
-                                        bytes=exported_auth.bytes
-                                    )
-                                )
-                            except AuthBytesInvalid:
-                                continue
-                            else:
-                                break
-                        else:
-                            raise AuthBytesInvalid
+                    if not session:
+                        session = self.media_sessions[dc_id] = await self.start_session_pool(dc_id, is_media=True)
 
                 r = await session.invoke(
                     raw.functions.upload.GetFile(
@@ -1152,14 +1314,9 @@ class Client(Methods):
                         )
 
                 elif isinstance(r, raw.types.upload.FileCdnRedirect):
-                    cdn_session = Session(
-                        self, r.dc_id, await Auth(self, r.dc_id, await self.storage.test_mode()).create(),
-                        await self.storage.test_mode(), is_media=True, is_cdn=True
-                    )
+                    cdn_session = await self.start_dc_session(r.dc_id, is_media=True, is_cdn=True)
 
                     try:
-                        await cdn_session.start()
-
                         while True:
                             r2 = await cdn_session.invoke(
                                 raw.functions.upload.GetCdnFile(
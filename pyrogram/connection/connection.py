@@ -18,9 +18,11 @@
 
 import asyncio
 import logging
-from typing import Optional, Type
+import time
+from typing import Optional, Type, List, Tuple, Dict
 
-from .transport import TCP, TCPAbridged
+from .transport import TCP, TCPAbridged, TCPObfuscated
+from ..crypto.executor import CryptoExecutor
 from ..session.internals import DataCenter
 
 log = logging.getLogger(__name__)
@@ -29,6 +31,11 @@ log = logging.getLogger(__name__)
 class Connection:
     MAX_CONNECTION_ATTEMPTS = 3
 
+    # Happy Eyeballs: when there are several candidate addresses, the next one is tried if the previous attempt
+    # neither succeeded nor failed within this delay, and the first connection established wins
+    # https://datatracker.ietf.org/doc/html/rfc8305
+    CONNECTION_ATTEMPT_DELAY = 0.25
+
     def __init__(
         self,
         dc_id: int,
@@ -36,7 +43,9 @@ class Connection:
         ipv6: bool,
         proxy: dict,
         media: bool = False,
-        protocol_factory: Type[TCP] = TCPAbridged
+        protocol_factory: Type[TCP] = TCPAbridged,
+        addresses: Optional[List[Tuple[str, int]]] = None,
+        crypto_executor: Optional[CryptoExecutor] = None
     ) -> None:
         self.dc_id = dc_id
         self.test_mode = test_mode
@@ -44,33 +53,111 @@ class Connection:
         self.proxy = proxy
         self.media = media
         self.protocol_factory = protocol_factory
+        self.crypto_executor = crypto_executor
 
-        self.address = DataCenter(dc_id, test_mode, ipv6, media)
+        self.addresses = addresses or [DataCenter(dc_id, test_mode, ipv6, media)]
+        self.address = self.addresses[0]
         self.protocol: Optional[TCP] = None
 
+        # Connect latency, in seconds, of each address attempted; None for the failed ones
+        self.latencies: Dict[Tuple[str, int], Optional[float]] = {}
+
+    async def attempt(self, address: Tuple[str, int]) -> Tuple[TCP, Tuple[str, int]]:
+        kwargs = {}
+
+        # Only the obfuscated transports do crypto work of their own
+        if issubclass(self.protocol_factory, TCPObfuscated):
+            kwargs["crypto_executor"] = self.crypto_executor
+
+        protocol = self.protocol_factory(ipv6=":" in address[0], proxy=self.proxy, **kwargs)
+        started = time.perf_counter()
+
+        try:
+            await protocol.connect(address)
+        except BaseException as e:
+            await protocol.close()
+
+            if not isinstance(e, asyncio.CancelledError):
+                self.latencies[address] = None
+
+            raise
+
+        self.latencies[address] = time.perf_counter() - started
+
+        return protocol, address
+
+    async def race(self) -> Tuple[TCP, Tuple[str, int]]:
+        running = set()
+        winner = None
+        error = None
+
+        def pick(done):
+            nonlocal winner, error
+
+            for task in done:
+                if task.exception() is None:
+                    if winner is None:
+                        winner = task.result()
+                    else:
+                        running.add(task)  # Closed below
+                else:
+                    error = task.exception()
+                    log.warning("Unable to connect due to network issues: %s", error)
+
+        try:
+            for address in self.addresses:
+                running.add(asyncio.ensure_future(self.attempt(address)))
+
+                # The next address is tried as soon as an attempt fails or the delay elapses, whichever comes first
+                done, running = await asyncio.wait(
+                    running,
+                    timeout=self.CONNECTION_ATTEMPT_DELAY,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                pick(done)
+
+                if winner is not None:
+                    return winner
+
+            while running and winner is None:
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                pick(done)
+
+            if winner is None:
+                raise error
+
+            return winner
+        finally:
+            for task in running:
+                task.cancel()
+
+            for result in await asyncio.gather(*running, return_exceptions=True):
+                if isinstance(result, tuple):
+                    await result[0].close()
+
     async def connect(self) -> None:
         for i in range(Connection.MAX_CONNECTION_ATTEMPTS):
-            self.protocol = self.protocol_factory(ipv6=self.ipv6, proxy=self.proxy)
-
             try:
                 log.info("Connecting...")
-                await self.protocol.connect(self.address)
-            except OSError as e:
-                log.warning("Unable to connect due to network issues: %s", e)
-                await self.protocol.close()
+                self.protocol, self.address = await self.race()
+            except OSError:
                 await asyncio.sleep(1)
             else:
-                log.info("Connected! %s DC%s%s - IPv%s",
+                log.info("Connected! %s DC%s%s - %s:%s",
                          "Test" if self.test_mode else "Production",
                          self.dc_id,
                          " (media)" if self.media else "",
-                         "6" if self.ipv6 else "4")
+                         *self.address)
                 break
         else:
             log.warning("Connection failed! Trying again...")
             raise ConnectionError
 
     async def close(self) -> None:
+        if self.protocol is None:
+            return
+
         await self.protocol.close()
         log.info("Disconnected")
 
@@ -16,9 +16,14 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+from .proxy import ProxyError
 from .tcp import TCP, Proxy
 from .tcp_abridged import TCPAbridged
+from .tcp_abridged_buffered import TCPAbridgedBuffered
 from .tcp_abridged_o import TCPAbridgedO
+from .tcp_buffered import TCPBuffered
 from .tcp_full import TCPFull
 from .tcp_intermediate import TCPIntermediate
+from .tcp_intermediate_buffered import TCPIntermediateBuffered
 from .tcp_intermediate_o import TCPIntermediateO
+from .tcp_obfuscated import TCPObfuscated
@@ -0,0 +1,227 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import ipaddress
+import logging
+import socket
+from base64 import b64encode
+from struct import pack
+from typing import Awaitable, Callable, Dict, Optional, Tuple, TypedDict
+
+log = logging.getLogger(__name__)
+
+SOCKS5_ERRORS = {
+    0x01: "General SOCKS server failure",
+    0x02: "Connection not allowed by ruleset",
+    0x03: "Network unreachable",
+    0x04: "Host unreachable",
+    0x05: "Connection refused",
+    0x06: "TTL expired",
+    0x07: "Command not supported",
+    0x08: "Address type not supported",
+}
+
+
+class Proxy(TypedDict):
+    scheme: str
+    hostname: str
+    port: int
+    username: Optional[str]
+    password: Optional[str]
+
+
+class ProxyError(ConnectionError):
+    pass
+
+
+async def recv_exactly(sock: socket.socket, length: int) -> bytes:
+    loop = asyncio.get_running_loop()
+    data = bytearray()
+
+    while len(data) < length:
+        chunk = await loop.sock_recv(sock, length - len(data))
+
+        if not chunk:
+            raise ProxyError("Proxy closed the connection")
+
+        data += chunk
+
+    return bytes(data)
+
+
+async def socks4(
+    sock: socket.socket,
+    host: str,
+    port: int,
+    username: Optional[str],
+    password: Optional[str]
+) -> None:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        # SOCKS4a: let the proxy resolve the hostname
+        address, hostname = ipaddress.IPv4Address("0.0.0.1"), host.encode() + b"\x00"
+    else:
+        hostname = b""
+
+    if address.version != 4:
+        raise ProxyError("SOCKS4 proxies don't support IPv6 destinations")
+
+    request = pack(">BBH", 4, 1, port) + address.packed + (username or "").encode() + b"\x00" + hostname
+    await asyncio.get_running_loop().sock_sendall(sock, request)
+
+    reply = await recv_exactly(sock, 8)
+
+    if reply[1] != 0x5a:
+        raise ProxyError(f"SOCKS4 proxy rejected the connection (code {reply[1]:#x})")
+
+
+async def socks5(
+    sock: socket.socket,
+    host: str,
+    port: int,
+    username: Optional[str],
+    password: Optional[str]
+) -> None:
+    loop = asyncio.get_running_loop()
+    methods = b"\x00\x02" if username is not None else b"\x00"
+
+    await loop.sock_sendall(sock, b"\x05" + bytes([len(methods)]) + methods)
+    version, method = await recv_exactly(sock, 2)
+
+    if version != 5:
+        raise ProxyError("Invalid SOCKS5 proxy response")
+
+    if method == 0x02:
+        username, password = username.encode(), (password or "").encode()
+
+        await loop.sock_sendall(
+            sock,
+            b"\x01" + bytes([len(username)]) + username + bytes([len(password)]) + password
+        )
+
+        if (await recv_exactly(sock, 2))[1] != 0:
+            raise ProxyError("SOCKS5 proxy authentication failed")
+    elif method != 0x00:
+        raise ProxyError("SOCKS5 proxy requires an unsupported authentication method")
+
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        destination = b"\x03" + bytes([len(host.encode())]) + host.encode()
+    else:
+        destination = (b"\x01" if address.version == 4 else b"\x04") + address.packed
+
+    await loop.sock_sendall(sock, b"\x05\x01\x00" + destination + pack(">H", port))
+    version, reply, _, address_type = await recv_exactly(sock, 4)
+
+    if version != 5:
+        raise ProxyError("Invalid SOCKS5 proxy response")
+
+    if reply != 0:
+        raise ProxyError(SOCKS5_ERRORS.get(reply, f"SOCKS5 proxy error (code {reply:#x})"))
+
+    # Skip the bound address and port
+    if address_type == 0x01:
+        await recv_exactly(sock, 4 + 2)
+    elif address_type == 0x04:
+        await recv_exactly(sock, 16 + 2)
+    elif address_type == 0x03:
+        await recv_exactly(sock, (await recv_exactly(sock, 1))[0] + 2)
+    else:
+        raise ProxyError("Invalid SOCKS5 proxy response")
+
+
+async def http(
+    sock: socket.socket,
+    host: str,
+    port: int,
+    username: Optional[str],
+    password: Optional[str]
+) -> None:
+    loop = asyncio.get_running_loop()
+    authority = f"[{host}]:{port}" if ":" in host else f"{host}:{port}"
+    request = f"CONNECT {authority} HTTP/1.1\r\nHost: {authority}\r\n"
+
+    if username is not None:
+        credentials = b64encode(f"{username}:{password or ''}".encode()).decode()
+        request += f"Proxy-Authorization: Basic {credentials}\r\n"
+
+    await loop.sock_sendall(sock, (request + "\r\n").encode())
+
+    # Read one byte at a time: nothing past the response headers may be consumed, that's tunnel data
+    response = bytearray()
+
+    while not response.endswith(b"\r\n\r\n"):
+        if len(response) > 16 * 1024:
+            raise ProxyError("HTTP proxy response is too long")
+
+        response += await recv_exactly(sock, 1)
+
+    status_line = bytes(response.split(b"\r\n", 1)[0])
+    status = status_line.split(b" ", 2)
+
+    if len(status) < 2 or not status[0].startswith(b"HTTP/") or status[1] != b"200":
+        raise ProxyError(f"HTTP proxy refused the connection: {status_line.decode(errors='replace')}")
+
+
+handshakes: Dict[str, Callable[..., Awaitable[None]]] = {
+    "SOCKS4": socks4,
+    "SOCKS5": socks5,
+    "HTTP": http,
+}
+
+
+async def open_proxy_socket(proxy: Proxy, destination: Tuple[str, int]) -> socket.socket:
+    """Connect to the proxy and tunnel to *destination*, returning the connected non-blocking socket."""
+    scheme = proxy.get("scheme")
+    if scheme is None:
+        raise ValueError("No scheme specified")
+
+    handshake = handshakes.get(scheme.upper())
+    if handshake is None:
+        raise ValueError(f"Unknown proxy type {scheme}")
+
+    loop = asyncio.get_running_loop()
+    addresses = await loop.getaddrinfo(proxy.get("hostname"), proxy.get("port"), type=socket.SOCK_STREAM)
+    error = None
+
+    for family, type_, proto, _, address in addresses:
+        sock = socket.socket(family, type_, proto)
+        sock.setblocking(False)
+
+        try:
+            await loop.sock_connect(sock, address)
+        except OSError as e:
+            sock.close()
+            error = e
+            continue
+        except BaseException:
+            sock.close()
+            raise
+
+        try:
+            await handshake(sock, *destination, proxy.get("username"), proxy.get("password"))
+        except BaseException:
+            sock.close()
+            raise
+
+        return sock
+
+    raise error or OSError("Unable to resolve the proxy address")
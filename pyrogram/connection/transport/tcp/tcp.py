@@ -17,33 +17,19 @@
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 import asyncio
-import ipaddress
 import logging
 import socket
-from concurrent.futures import ThreadPoolExecutor
-from typing import Tuple, Dict, TypedDict, Optional
+from typing import Tuple, Optional, List
 
-import socks
+from .proxy import Proxy, open_proxy_socket
 
 log = logging.getLogger(__name__)
 
-proxy_type_by_scheme: Dict[str, int] = {
-    "SOCKS4": socks.SOCKS4,
-    "SOCKS5": socks.SOCKS5,
-    "HTTP": socks.HTTP,
-}
-
-
-class Proxy(TypedDict):
-    scheme: str
-    hostname: str
-    port: int
-    username: Optional[str]
-    password: Optional[str]
-
 
 class TCP:
     TIMEOUT = 10
+    # Writers only wait for the socket to drain once this many bytes are buffered in the transport
+    WRITE_BUFFER_HIGH_WATER = 256 * 1024
 
     def __init__(self, ipv6: bool, proxy: Proxy) -> None:
         self.ipv6 = ipv6
@@ -51,55 +37,30 @@ class TCP:
 
         self.reader: Optional[asyncio.StreamReader] = None
         self.writer: Optional[asyncio.StreamWriter] = None
+        self.transport: Optional[asyncio.WriteTransport] = None
+
+        # Segments queued by send() within the same loop iteration are flushed together in one writelines call
+        self.write_buffer: List[bytes] = []
+        self.write_buffer_size = 0
+        self.flush_handle: Optional[asyncio.Handle] = None
+        self.write_exception: Optional[Exception] = None
 
         self.read_lock = asyncio.Lock()
         self.write_lock = asyncio.Lock()
         self.loop = asyncio.get_event_loop()
 
+    async def _open_connection(self, **kwargs) -> None:
+        self.reader, self.writer = await asyncio.open_connection(**kwargs)
+        self.transport = self.writer.transport
+        self.transport.set_write_buffer_limits(high=TCP.WRITE_BUFFER_HIGH_WATER)
+
     async def _connect_via_proxy(
         self,
         destination: Tuple[str, int]
     ) -> None:
-        scheme = self.proxy.get("scheme")
-        if scheme is None:
-            raise ValueError("No scheme specified")
-
-        proxy_type = proxy_type_by_scheme.get(scheme.upper())
-        if proxy_type is None:
-            raise ValueError(f"Unknown proxy type {scheme}")
+        sock = await open_proxy_socket(self.proxy, destination)
 
-        hostname = self.proxy.get("hostname")
-        port = self.proxy.get("port")
-        username = self.proxy.get("username")
-        password = self.proxy.get("password")
-
-        try:
-            ip_address = ipaddress.ip_address(hostname)
-        except ValueError:
-            is_proxy_ipv6 = False
-        else:
-            is_proxy_ipv6 = isinstance(ip_address, ipaddress.IPv6Address)
-
-        proxy_family = socket.AF_INET6 if is_proxy_ipv6 else socket.AF_INET
-        sock = socks.socksocket(proxy_family)
-
-        sock.set_proxy(
-            proxy_type=proxy_type,
-            addr=hostname,
-            port=port,
-            username=username,
-            password=password
-        )
-        sock.settimeout(TCP.TIMEOUT)
-
-        with ThreadPoolExecutor() as executor:
-            await self.loop.run_in_executor(executor, sock.connect, destination)
-
-        sock.setblocking(False)
-
-        self.reader, self.writer = await asyncio.open_connection(
-            sock=sock
-        )
+        await self._open_connection(sock=sock)
 
     async def _connect_via_direct(
         self,
@@ -107,7 +68,7 @@ class TCP:
     ) -> None:
         host, port = destination
         family = socket.AF_INET6 if self.ipv6 else socket.AF_INET
-        self.reader, self.writer = await asyncio.open_connection(
+        await self._open_connection(
             host=host,
             port=port,
             family=family
@@ -125,27 +86,80 @@ class TCP:
         except asyncio.TimeoutError:  # Re-raise as TimeoutError. asyncio.TimeoutError is deprecated in 3.11
             raise TimeoutError("Connection timed out")
 
+    async def wait_closed(self) -> None:
+        await self.writer.wait_closed()
+
+    async def drain(self) -> None:
+        await self.writer.drain()
+
+    def flush(self) -> None:
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+
+        if not self.write_buffer:
+            return
+
+        segments, self.write_buffer = self.write_buffer, []
+        self.write_buffer_size = 0
+
+        try:
+            self.write(segments)
+        except Exception as e:
+            self.write_exception = e
+
+    def write(self, segments: List[bytes]) -> None:
+        self.transport.writelines(segments)
+
     async def close(self) -> None:
-        if self.writer is None:
+        if self.transport is None:
             return None
 
+        self.flush()
+
         try:
-            self.writer.close()
-            await asyncio.wait_for(self.writer.wait_closed(), TCP.TIMEOUT)
+            self.transport.close()
+            await asyncio.wait_for(self.wait_closed(), TCP.TIMEOUT)
         except Exception as e:
             log.info("Close exception: %s %s", type(e).__name__, e)
 
-    async def send(self, data: bytes) -> None:
-        if self.writer is None:
+    async def send(self, *data: bytes) -> None:
+        if self.transport is None:
+            return None
+
+        try:
+            if self.write_exception is not None:
+                raise self.write_exception
+
+            if self.transport.is_closing():
+                raise ConnectionResetError("Connection lost")
+
+            self.write_buffer.extend(data)
+            self.write_buffer_size += sum(len(i) for i in data)
+
+            if self.flush_handle is None:
+                self.flush_handle = self.loop.call_soon(self.flush)
+
+            if self.write_buffer_size + self.transport.get_write_buffer_size() > TCP.WRITE_BUFFER_HIGH_WATER:
+                self.flush()
+
+                async with self.write_lock:
+                    await self.drain()
+        except Exception as e:
+            log.info("Send exception: %s %s", type(e).__name__, e)
+            raise OSError(e)
+
+    async def recv_some(self, size: int) -> Optional[bytes]:
+        """Receive up to *size* bytes, whatever is available as soon as something is."""
+        if not self.reader:
+            return None
+
+        try:
+            chunk = await asyncio.wait_for(self.reader.read(size), TCP.TIMEOUT)
+        except (OSError, asyncio.TimeoutError):
             return None
 
-        async with self.write_lock:
-            try:
-                self.writer.write(data)
-                await self.writer.drain()
-            except Exception as e:
-                log.info("Send exception: %s %s", type(e).__name__, e)
-                raise OSError(e)
+        return chunk or None
 
     async def recv(self, length: int = 0) -> Optional[bytes]:
         if not self.reader:
@@ -0,0 +1,47 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+from typing import Optional, Tuple
+
+from .tcp import Proxy
+from .tcp_abridged import TCPAbridged
+from .tcp_buffered import TCPBuffered
+
+log = logging.getLogger(__name__)
+
+
+class TCPAbridgedBuffered(TCPAbridged, TCPBuffered):
+    def __init__(self, ipv6: bool, proxy: Proxy) -> None:
+        super().__init__(ipv6, proxy)
+
+    @staticmethod
+    def parse_header(data: memoryview) -> Optional[Tuple[int, int]]:
+        if not data:
+            return None
+
+        if data[0] != 0x7f:
+            return 1, data[0] * 4
+
+        if len(data) < 4:
+            return None
+
+        return 4, int.from_bytes(data[1:4], "little") * 4
+
+    async def recv(self, length: int = 0) -> Optional[memoryview]:
+        return await TCPBuffered.recv(self)
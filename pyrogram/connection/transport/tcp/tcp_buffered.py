@@ -0,0 +1,227 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import logging
+from collections import deque
+from typing import Callable, Deque, Optional, Tuple
+
+from .tcp import TCP, Proxy
+
+log = logging.getLogger(__name__)
+
+HeaderParser = Callable[[memoryview], Optional[Tuple[int, int]]]
+
+
+class FrameProtocol(asyncio.BufferedProtocol):
+    """Receive transport frames straight into a preallocated buffer.
+
+    The event loop reads into the free tail of the buffer; frame headers are parsed in place and complete frames
+    are queued as memoryviews over the buffer, so payloads are never copied or concatenated. When the buffer fills
+    up, the pending partial frame is moved to a fresh buffer instead of wrapping around, because frames handed out
+    earlier may still be referenced by the session.
+
+    Reading is paused while more than ``MAX_PENDING_FRAMES`` frames or ``MAX_PENDING_BYTES`` bytes are waiting to
+    be received, and resumed once the reader has caught up, so a slow consumer pushes back on the socket instead of
+    letting the queue grow without bound.
+    """
+
+    MIN_READ_SIZE = 64 * 1024
+    MAX_PENDING_FRAMES = 256
+    MAX_PENDING_BYTES = 8 * 1024 * 1024
+
+    def __init__(self, parse_header: HeaderParser, buffer_size: int) -> None:
+        self.parse_header = parse_header
+        self.buffer_size = buffer_size
+
+        self.buffer = bytearray(buffer_size)
+        self.view = memoryview(self.buffer)
+        self.start = 0  # Beginning of the first incomplete frame
+        self.end = 0  # End of the received data
+
+        self.frames: Deque[memoryview] = deque()
+        self.pending_bytes = 0
+        self.transport: Optional[asyncio.Transport] = None
+        self.reading_paused = False
+        self.waiter: Optional[asyncio.Future] = None
+        self.drain_waiter: Optional[asyncio.Future] = None
+        self.paused = False
+        self.exception: Optional[Exception] = None
+
+        self.loop = asyncio.get_event_loop()
+        self.closed = self.loop.create_future()
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+
+    def rotate(self, size: int) -> None:
+        pending = self.view[self.start:self.end]
+
+        self.buffer = bytearray(max(size, self.buffer_size))
+        self.view = memoryview(self.buffer)
+        self.view[:len(pending)] = pending
+        self.start = 0
+        self.end = len(pending)
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        if len(self.buffer) - self.end < self.MIN_READ_SIZE:
+            self.rotate(self.end - self.start + self.MIN_READ_SIZE)
+
+        return self.view[self.end:]
+
+    def buffer_updated(self, nbytes: int) -> None:
+        self.end += nbytes
+
+        while True:
+            header = self.parse_header(self.view[self.start:self.end])
+
+            if header is None:
+                break
+
+            header_length, length = header
+            total = header_length + length
+
+            if self.end - self.start < total:
+                if self.start + total > len(self.buffer):
+                    self.rotate(total + self.MIN_READ_SIZE)
+
+                break
+
+            self.frames.append(self.view[self.start + header_length:self.start + total])
+            self.pending_bytes += length
+            self.start += total
+
+        if self.frames:
+            self.wakeup()
+
+        if not self.reading_paused and (
+            len(self.frames) > self.MAX_PENDING_FRAMES
+            or self.pending_bytes > self.MAX_PENDING_BYTES
+        ):
+            self.reading_paused = True
+            self.transport.pause_reading()
+
+    def maybe_resume_reading(self) -> None:
+        # Resume at half the limits, so that reading doesn't flip on and off with every frame
+        if self.reading_paused and (
+            len(self.frames) <= self.MAX_PENDING_FRAMES // 2
+            and self.pending_bytes <= self.MAX_PENDING_BYTES // 2
+        ):
+            self.reading_paused = False
+
+            if not self.transport.is_closing():
+                self.transport.resume_reading()
+
+    def wakeup(self) -> None:
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(None)
+
+    def eof_received(self) -> bool:
+        return False
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.exception = exc or ConnectionResetError("Connection lost")
+
+        if not self.closed.done():
+            self.closed.set_result(None)
+
+        if self.drain_waiter is not None and not self.drain_waiter.done():
+            self.drain_waiter.set_exception(self.exception)
+
+        self.wakeup()
+
+    def pause_writing(self) -> None:
+        self.paused = True
+
+    def resume_writing(self) -> None:
+        self.paused = False
+
+        if self.drain_waiter is not None and not self.drain_waiter.done():
+            self.drain_waiter.set_result(None)
+
+    async def drain(self) -> None:
+        if self.exception is not None:
+            raise self.exception
+
+        if not self.paused:
+            return
+
+        self.drain_waiter = self.loop.create_future()
+
+        try:
+            await self.drain_waiter
+        finally:
+            self.drain_waiter = None
+
+    async def recv(self, timeout: float) -> Optional[memoryview]:
+        while not self.frames:
+            if self.exception is not None:
+                return None
+
+            self.waiter = self.loop.create_future()
+
+            try:
+                await asyncio.wait_for(self.waiter, timeout)
+            except asyncio.TimeoutError:
+                return None
+            finally:
+                self.waiter = None
+
+        frame = self.frames.popleft()
+        self.pending_bytes -= len(frame)
+        self.maybe_resume_reading()
+
+        return frame
+
+
+class TCPBuffered(TCP):
+    """Base for transports that receive through a :class:`FrameProtocol`.
+
+    Subclasses provide ``parse_header``, which returns the header and payload length of the frame at the start of
+    the given data, or None if the header is not complete yet. Received frames are returned as memoryviews.
+    """
+
+    BUFFER_SIZE = 2 * 1024 * 1024
+
+    def __init__(self, ipv6: bool, proxy: Proxy) -> None:
+        super().__init__(ipv6, proxy)
+
+        self.protocol: Optional[FrameProtocol] = None
+
+    @staticmethod
+    def parse_header(data: memoryview) -> Optional[Tuple[int, int]]:
+        raise NotImplementedError
+
+    async def _open_connection(self, **kwargs) -> None:
+        self.transport, self.protocol = await self.loop.create_connection(
+            lambda: FrameProtocol(self.parse_header, self.BUFFER_SIZE),
+            **kwargs
+        )
+        self.transport.set_write_buffer_limits(high=TCP.WRITE_BUFFER_HIGH_WATER)
+
+    async def wait_closed(self) -> None:
+        await asyncio.shield(self.protocol.closed)
+
+    async def drain(self) -> None:
+        await self.protocol.drain()
+
+    async def recv(self, length: int = 0) -> Optional[memoryview]:
+        if self.protocol is None:
+            return None
+
+        return await self.protocol.recv(TCP.TIMEOUT)
@@ -0,0 +1,139 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import logging
+import os
+from typing import List, Optional, Tuple
+
+import pyrogram
+from pyrogram.crypto import aes
+from pyrogram.crypto.executor import CryptoExecutor
+from .tcp import TCP, Proxy
+
+log = logging.getLogger(__name__)
+
+
+class TCPObfuscated(TCP):
+    """Base for the obfuscated transports, which wrap the whole byte stream in AES-256-CTR.
+
+    Received data is decrypted in bulk as it comes and frames are read from the plaintext buffer; outgoing frames
+    queued in the same loop iteration are encrypted together in one call when flushed. Both directions run their
+    crypto on the loop for small chunks and on the connection's crypto worker for large ones (e.g.: file parts).
+    """
+
+    RESERVED = (b"HEAD", b"POST", b"GET ", b"OPTI", b"\xee" * 4)
+    # Protocol tag sent in the handshake
+    TAG = b""
+
+    READ_SIZE = 256 * 1024
+    # Chunks smaller than this are encrypted or decrypted on the loop, larger ones on the crypto worker
+    CRYPTO_INLINE_THRESHOLD = 16 * 1024
+
+    def __init__(self, ipv6: bool, proxy: Proxy, crypto_executor: Optional[CryptoExecutor] = None) -> None:
+        super().__init__(ipv6, proxy)
+
+        self.encryptor: Optional[aes.CTR256] = None
+        self.decryptor: Optional[aes.CTR256] = None
+        self.buffer = bytearray()
+
+        # Last write whose data is being encrypted on the crypto worker, the following ones are written after it
+        self.pending_write: Optional[asyncio.Task] = None
+
+        # The CTR state must be advanced in order, so all the crypto work of this connection runs on the same worker
+        self.crypto_worker = (crypto_executor or pyrogram.crypto_executor).pin()
+
+    async def connect(self, address: Tuple[str, int]) -> None:
+        await super().connect(address)
+
+        while True:
+            nonce = bytearray(os.urandom(64))
+
+            if bytes([nonce[0]]) != b"\xef" and nonce[:4] not in self.RESERVED and nonce[4:8] != b"\x00" * 4:
+                nonce[56:60] = self.TAG
+                break
+
+        temp = bytearray(nonce[55:7:-1])
+
+        self.encryptor = aes.CTR256(nonce[8:40], nonce[40:56])
+        self.decryptor = aes.CTR256(temp[0:32], temp[32:48])
+
+        nonce[56:64] = self.encryptor(nonce)[56:64]
+
+        # The nonce is only partially encrypted, so it bypasses the write path
+        self.transport.write(bytes(nonce))
+
+    def write(self, segments: List[bytes]) -> None:
+        data = b"".join(segments)
+
+        if len(data) < self.CRYPTO_INLINE_THRESHOLD and self.pending_write is None:
+            self.transport.write(self.crypto_worker.run(self.encryptor, data))
+            return
+
+        # The worker runs its tasks in submission order, so the keystream advances in the same order as the writes.
+        # Once a write is offloaded, the following ones queue behind it until it's done, small ones included
+        encrypted = self.loop.run_in_executor(self.crypto_worker, self.encryptor, data)
+        self.pending_write = self.loop.create_task(self.write_encrypted(self.pending_write, encrypted))
+
+    async def write_encrypted(self, previous: Optional[asyncio.Task], encrypted: asyncio.Future) -> None:
+        try:
+            if previous is not None:
+                await previous
+
+            data = await encrypted
+
+            if self.write_exception is None:
+                self.transport.write(data)
+        except Exception as e:
+            self.write_exception = e
+        finally:
+            if self.pending_write is asyncio.current_task():
+                self.pending_write = None
+
+    async def drain(self) -> None:
+        # Data still being encrypted is not in the transport buffer yet
+        if self.pending_write is not None:
+            await asyncio.shield(self.pending_write)
+
+        await super().drain()
+
+    async def close(self) -> None:
+        if self.transport is not None:
+            self.flush()
+
+            if self.pending_write is not None:
+                await asyncio.gather(self.pending_write, return_exceptions=True)
+
+        await super().close()
+
+    async def read(self, length: int) -> Optional[bytes]:
+        while len(self.buffer) < length:
+            chunk = await self.recv_some(self.READ_SIZE)
+
+            if chunk is None:
+                return None
+
+            if len(chunk) < self.CRYPTO_INLINE_THRESHOLD:
+                self.buffer += self.crypto_worker.run(self.decryptor, chunk)
+            else:
+                self.buffer += await self.loop.run_in_executor(self.crypto_worker, self.decryptor, chunk)
+
+        data = bytes(self.buffer[:length])
+        del self.buffer[:length]
+
+        return data
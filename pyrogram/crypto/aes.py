@@ -128,3 +128,19 @@ except ImportError:
                     chunk = cipher.encrypt(iv)
 
         return out
+
+
+class CTR256:
+    """Streaming AES-256-CTR cipher.
+
+    Consecutive calls continue the same keystream, so a byte stream can be encrypted or decrypted in chunks of any
+    size. Calls must happen in stream order.
+    """
+
+    def __init__(self, key: bytes, iv: bytes) -> None:
+        self.key = bytes(key)
+        self.iv = bytearray(iv)
+        self.state = bytearray(1)
+
+    def __call__(self, data: bytes) -> bytes:
+        return ctr256_encrypt(data, self.key, self.iv, self.state)
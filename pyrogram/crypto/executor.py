@@ -0,0 +1,150 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import itertools
+import threading
+import time
+import weakref
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Callable, Any, Dict, List
+
+
+class CryptoWorker(Executor):
+    """A single crypto thread.
+
+    Work submitted to the same worker runs in submission order, which is what sessions and stateful ciphers
+    (e.g.: AES-CTR used by obfuscated transports) rely on when they pin themselves to a worker.
+    """
+
+    def __init__(self, name: str):
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix=name)
+        self.lock = threading.Lock()
+
+        self.pending = 0
+        self.tasks = 0
+        self.inline_tasks = 0
+        self.queue_wait = 0.0
+        self.busy_time = 0.0
+
+    def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        with self.lock:
+            self.pending += 1
+
+        return self.executor.submit(self._run, time.perf_counter(), fn, args, kwargs)
+
+    def run(self, fn: Callable, *args: Any) -> Any:
+        """Run a function directly in the calling thread, accounting its time as busy time."""
+        started = time.perf_counter()
+
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+
+            with self.lock:
+                self.inline_tasks += 1
+                self.busy_time += elapsed
+
+    def shutdown(self, wait: bool = True, **kwargs: Any):
+        self.executor.shutdown(wait, **kwargs)
+
+    def _run(self, submitted: float, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        started = time.perf_counter()
+
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            finished = time.perf_counter()
+
+            with self.lock:
+                self.pending -= 1
+                self.tasks += 1
+                self.queue_wait += started - submitted
+                self.busy_time += finished - started
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "pending": self.pending,
+                "tasks": self.tasks,
+                "inline_tasks": self.inline_tasks,
+                "queue_wait": self.queue_wait,
+                "busy_time": self.busy_time
+            }
+
+
+class CryptoExecutor(Executor):
+    """A pool of crypto workers.
+
+    tgcrypto releases the GIL, so spreading sessions over multiple workers lets encryption and decryption use
+    multiple cores. Each session pins itself to one worker (see :meth:`pin`), so its own crypto work stays ordered.
+
+    Parameters:
+        workers (``int``, *optional*):
+            Number of crypto threads.
+            Defaults to 1.
+    """
+
+    instances = weakref.WeakSet()
+
+    def __init__(self, workers: int = 1):
+        if workers < 1:
+            raise ValueError("At least one crypto worker is required")
+
+        self.workers: List[CryptoWorker] = [CryptoWorker(f"CryptoWorker{i}") for i in range(workers)]
+        self.next_worker = itertools.cycle(self.workers)
+
+        CryptoExecutor.instances.add(self)
+
+    def pin(self) -> CryptoWorker:
+        """Get a worker to run all the crypto work of a session or connection on."""
+        return next(self.next_worker)
+
+    def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        return min(self.workers, key=lambda w: w.pending).submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True, **kwargs: Any):
+        for worker in self.workers:
+            worker.shutdown(wait, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the aggregated stats of this executor.
+
+        Returns:
+            ``dict``: The number of workers, pending and completed tasks (offloaded and run inline), plus the total
+            time tasks spent waiting in queue and running, in seconds.
+        """
+        stats = {"workers": len(self.workers), "pending": 0, "tasks": 0, "inline_tasks": 0,
+                 "queue_wait": 0.0, "busy_time": 0.0}
+
+        for worker in self.workers:
+            for key, value in worker.stats().items():
+                stats[key] += value
+
+        return stats
+
+    @classmethod
+    def process_stats(cls) -> Dict[str, Any]:
+        """Get the aggregated stats of all the crypto executors in this process."""
+        stats = {"workers": 0, "pending": 0, "tasks": 0, "inline_tasks": 0, "queue_wait": 0.0, "busy_time": 0.0}
+
+        for executor in list(cls.instances):
+            for key, value in executor.stats().items():
+                stats[key] += value
+
+        return stats
@@ -39,15 +39,19 @@ def kdf(auth_key: bytes, msg_key: bytes, outgoing: bool) -> tuple:
 
 
 def pack(message: Message, salt: int, session_id: bytes, auth_key: bytes, auth_key_id: bytes) -> bytes:
-    data = Long(salt) + session_id + message.write()
-    padding = urandom(-(len(data) + 12) % 16 + 12)
+    # Build the plaintext in a single buffer: hashing and encryption both work on it without further copies
+    data = bytearray(Long(salt))
+    data += session_id
+    data += message.write()
+    data += urandom(-(len(data) + 12) % 16 + 12)  # Padding
 
     # 88 = 88 + 0 (outgoing message)
-    msg_key_large = sha256(auth_key[88: 88 + 32] + data + padding).digest()
-    msg_key = msg_key_large[8:24]
+    msg_key_large = sha256(auth_key[88: 88 + 32])
+    msg_key_large.update(data)
+    msg_key = msg_key_large.digest()[8:24]
     aes_key, aes_iv = kdf(auth_key, msg_key, True)
 
-    return auth_key_id + msg_key + aes.ige256_encrypt(data + padding, aes_key, aes_iv)
+    return auth_key_id + msg_key + aes.ige256_encrypt(data, aes_key, aes_iv)
 
 
 def unpack(
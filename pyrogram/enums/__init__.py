@@ -36,6 +36,7 @@ from .poll_type import PollType
 from .privacy_key import PrivacyKey
 from .profile_color import ProfileColor
 from .reply_color import ReplyColor
+from .request_priority import RequestPriority
 from .sent_code_type import SentCodeType
 from .gift_attribute_type import GiftAttributeType
 from .stories_privacy_rules import StoriesPrivacyRules
@@ -62,6 +63,7 @@ __all__ = [
     'PrivacyKey',
     'ProfileColor',
     'ReplyColor',
+    'RequestPriority',
     'SentCodeType',
     'GiftAttributeType',
     'StoriesPrivacyRules',
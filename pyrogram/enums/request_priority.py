@@ -0,0 +1,39 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from enum import IntEnum
+
+
+class RequestPriority(IntEnum):
+    """Request priority enumeration used in :meth:`~pyrogram.Client.invoke`.
+
+    Requests with a higher priority are sent first and take the first free slot of the in-flight window.
+    The values are the indexes of the session queues, lower is more urgent.
+    """
+
+    INTERACTIVE = 0
+    "User facing requests that must be answered as soon as possible (e.g.: answering callback queries)."
+
+    NORMAL = 1
+    "Regular requests."
+
+    BULK = 2
+    "Background work that can wait (e.g.: exports, broadcasts, history scans)."
+
+    def __repr__(self):
+        return f"pyrogram.enums.{self.__class__.__name__}.{self.name}"
@@ -16,10 +16,12 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+import inspect
 import logging
+from typing import Callable, Optional, Any
 
 import pyrogram
-from pyrogram import raw
+from pyrogram import raw, enums
 from pyrogram.raw.core import TLObject
 from pyrogram.session import Session
 from pyrogram.methods.messages.business_session import get_session
@@ -34,7 +36,10 @@ class Invoke:
         retries: int = Session.MAX_RETRIES,
         timeout: float = Session.WAIT_TIMEOUT,
         sleep_threshold: float = None,
-        business_connection_id: str = None
+        business_connection_id: str = None,
+        priority: "enums.RequestPriority" = enums.RequestPriority.NORMAL,
+        fire_and_forget: bool = False,
+        error_callback: Callable = None
     ):
         """Invoke raw Telegram functions.
 
@@ -66,8 +71,24 @@ class Invoke:
             business_connection_id (``str``, *optional*):
                 Unique identifier of the business connection.
 
+            priority (:obj:`~pyrogram.enums.RequestPriority`, *optional*):
+                Priority of the request. Higher priority requests are sent first and don't queue behind lower priority
+                ones when the session has too many requests in flight.
+                Defaults to NORMAL.
+
+            fire_and_forget (``bool``, *optional*):
+                Pass True to send the request in the background and return immediately, without waiting for the
+                answer. Errors are passed to *error_callback*, if given, or logged otherwise. Requests still running
+                when the client is stopped are cancelled.
+                Defaults to False.
+
+            error_callback (``Callable``, *optional*):
+                A function (or coroutine function) to be called with the client and the exception in case the request
+                fails in fire-and-forget mode.
+
         Returns:
-            ``RawType``: The raw type response generated by the query.
+            ``RawType``: The raw type response generated by the query. In fire-and-forget mode, None is returned right
+            away.
 
         Raises:
             RPCError: In case of a Telegram RPC error.
@@ -75,6 +96,22 @@ class Invoke:
         if not self.is_connected:
             raise ConnectionError("Client has not been started yet")
 
+        if fire_and_forget:
+            task = self.loop.create_task(
+                self.invoke_in_background(
+                    error_callback, query, retries, timeout, sleep_threshold, business_connection_id, priority
+                )
+            )
+
+            # Keep a reference to the task until it's done, the event loop only keeps weak references
+            self.background_tasks.add(task)
+            task.add_done_callback(self.background_tasks.discard)
+
+            return None
+
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(query)
+
         session = self.session
 
         if business_connection_id:
@@ -95,10 +132,27 @@ class Invoke:
             query, retries, timeout,
             (sleep_threshold
              if sleep_threshold is not None
-             else self.sleep_threshold)
+             else self.sleep_threshold),
+            priority
         )
 
         await self.fetch_peers(getattr(r, "users", []))
         await self.fetch_peers(getattr(r, "chats", []))
 
         return r
+
+    async def invoke_in_background(self: "pyrogram.Client", error_callback: Optional[Callable], *args: Any):
+        try:
+            await self.invoke(*args)
+        except Exception as e:
+            if error_callback is None:
+                log.warning("Fire-and-forget request failed: %s", e)
+                return
+
+            try:
+                if inspect.iscoroutinefunction(error_callback):
+                    await error_callback(self, e)
+                else:
+                    error_callback(self, e)
+            except Exception as e:
+                log.exception(e)
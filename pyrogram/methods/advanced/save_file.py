@@ -30,7 +30,6 @@ from typing import Union, BinaryIO, Callable
 import pyrogram
 from pyrogram import StopTransmission
 from pyrogram import raw
-from pyrogram.session import Session
 
 log = logging.getLogger(__name__)
 
@@ -144,13 +143,11 @@ class SaveFile:
             md5_sum = md5() if not is_big and not is_missing_part else None
             dc_id = await self.storage.dc_id()
 
-            session = self.media_sessions.get(dc_id)
-            if not session:
-                session = self.media_sessions[dc_id] = Session(
-                    self, dc_id, await self.storage.auth_key(),
-                    await self.storage.test_mode(), is_media=True
-                )
-                await session.start()
+            async with self.media_sessions_lock:
+                session = self.media_sessions.get(dc_id)
+
+                if not session:
+                    session = self.media_sessions[dc_id] = await self.start_session_pool(dc_id, is_media=True)
 
             workers = [self.loop.create_task(worker(session)) for _ in range(workers_count)]
             queue = asyncio.Queue(1)
@@ -16,6 +16,7 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 import logging
 
 import pyrogram
@@ -43,6 +44,13 @@ class Terminate:
             await self.invoke(raw.functions.account.FinishTakeoutSession())
             log.info("Takeout session %s finished", self.takeout_id)
 
+        # Fire-and-forget requests must not outlive the client
+        for task in self.background_tasks:
+            task.cancel()
+
+        await asyncio.gather(*self.background_tasks, return_exceptions=True)
+        self.background_tasks.clear()
+
         await self.storage.save()
         await self.dispatcher.stop()
 
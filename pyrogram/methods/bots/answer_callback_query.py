@@ -16,6 +16,8 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+from typing import Callable
+
 import pyrogram
 from pyrogram import raw
 
@@ -27,7 +29,9 @@ class AnswerCallbackQuery:
         text: str = None,
         show_alert: bool = None,
         url: str = None,
-        cache_time: int = 0
+        cache_time: int = 0,
+        fire_and_forget: bool = False,
+        error_callback: Callable = None
     ):
         """Send answers to callback queries sent from inline keyboards.
         The answer will be displayed to the user as a notification at the top of the chat screen or as an alert.
@@ -55,8 +59,17 @@ class AnswerCallbackQuery:
                 The maximum amount of time in seconds that the result of the callback query may be cached client-side.
                 Telegram apps will support caching starting in version 3.14. Defaults to 0.
 
+            fire_and_forget (``bool``, *optional*):
+                Pass True to send the request in the background and return immediately, without waiting for the
+                answer. Errors are passed to *error_callback*, if given, or logged otherwise.
+                Defaults to False.
+
+            error_callback (``Callable``, *optional*):
+                A function (or coroutine function) to be called with the client and the exception in case the request
+                fails in fire-and-forget mode.
+
         Returns:
-            ``bool``: True, on success.
+            ``bool``: True, on success. In fire-and-forget mode, None is returned right away.
 
         Example:
             .. code-block:: python
@@ -69,6 +82,9 @@ class AnswerCallbackQuery:
 
                 # Answer with alert
                 await app.answer_callback_query(query_id, text=text, show_alert=True)
+
+                # Answer without waiting for the server
+                await app.answer_callback_query(query_id, fire_and_forget=True)
         """
         return await self.invoke(
             raw.functions.messages.SetBotCallbackAnswer(
@@ -77,5 +93,7 @@ class AnswerCallbackQuery:
                 alert=show_alert or None,
                 message=text or None,
                 url=url or None
-            )
+            ),
+            fire_and_forget=fire_and_forget,
+            error_callback=error_callback
         )
@@ -16,14 +16,14 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+from typing import Union
+
 import pyrogram
 from pyrogram import raw
-from pyrogram.errors import AuthBytesInvalid
-from pyrogram.session import Session
-from pyrogram.session.auth import Auth
+from pyrogram.session import Session, SessionPool
 
 
-async def get_session(client: "pyrogram.Client", business_connection_id: str) -> Session:
+async def get_session(client: "pyrogram.Client", business_connection_id: str) -> Union[Session, SessionPool]:
     dc_id = client.business_connections.get(business_connection_id)
 
     if dc_id is None:
@@ -42,34 +42,6 @@ async def get_session(client: "pyrogram.Client", business_connection_id: str) ->
         if client.sessions.get(dc_id):
             return client.sessions[dc_id]
 
-        session = client.sessions[dc_id] = Session(
-            client, dc_id,
-            await Auth(client, dc_id, await client.storage.test_mode()).create(),
-            await client.storage.test_mode()
-        )
-
-        await session.start()
-
-        for _ in range(3):
-            exported_auth = await client.invoke(
-                raw.functions.auth.ExportAuthorization(
-                    dc_id=dc_id
-                )
-            )
-
-            try:
-                await session.invoke(
-                    raw.functions.auth.ImportAuthorization(
-                        id=exported_auth.id,
-                        bytes=exported_auth.bytes
-                    )
-                )
-            except AuthBytesInvalid:
-                continue
-            else:
-                break
-        else:
-            await session.stop()
-            raise AuthBytesInvalid
+        session = client.sessions[dc_id] = await client.start_session_pool(dc_id)
 
         return session
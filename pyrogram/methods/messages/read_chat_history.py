@@ -16,7 +16,7 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from typing import Union
+from typing import Union, Callable
 
 import pyrogram
 from pyrogram import raw
@@ -26,7 +26,9 @@ class ReadChatHistory:
     async def read_chat_history(
         self: "pyrogram.Client",
         chat_id: Union[int, str],
-        max_id: int = 0
+        max_id: int = 0,
+        fire_and_forget: bool = False,
+        error_callback: Callable = None
     ) -> bool:
         """Mark a chat's message history as read.
 
@@ -42,8 +44,17 @@ class ReadChatHistory:
                 The id of the last message you want to mark as read; all the messages before this one will be marked as
                 read as well. Defaults to 0 (mark every unread message as read).
 
+            fire_and_forget (``bool``, *optional*):
+                Pass True to send the request in the background and return immediately, without waiting for the
+                answer. Errors are passed to *error_callback*, if given, or logged otherwise.
+                Defaults to False.
+
+            error_callback (``Callable``, *optional*):
+                A function (or coroutine function) to be called with the client and the exception in case the request
+                fails in fire-and-forget mode.
+
         Returns:
-            ``bool`` - On success, True is returned.
+            ``bool`` - On success, True is returned. In fire-and-forget mode, None is returned right away.
 
         Example:
             .. code-block:: python
@@ -68,6 +79,6 @@ class ReadChatHistory:
                 max_id=max_id
             )
 
-        await self.invoke(q)
+        await self.invoke(q, fire_and_forget=fire_and_forget, error_callback=error_callback)
 
-        return True
+        return None if fire_and_forget else True
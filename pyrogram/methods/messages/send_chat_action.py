@@ -16,7 +16,7 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from typing import Union
+from typing import Union, Callable
 
 import pyrogram
 from pyrogram import raw, enums
@@ -27,7 +27,9 @@ class SendChatAction:
         self: "pyrogram.Client",
         chat_id: Union[int, str],
         action: "enums.ChatAction",
-        business_connection_id: str = None
+        business_connection_id: str = None,
+        fire_and_forget: bool = False,
+        error_callback: Callable = None
     ) -> bool:
         """Tell the other party that something is happening on your side.
 
@@ -45,8 +47,17 @@ class SendChatAction:
             business_connection_id (``str``, *optional*):
                 Unique identifier of the business connection on behalf of which the message will be sent.
 
+            fire_and_forget (``bool``, *optional*):
+                Pass True to send the request in the background and return immediately, without waiting for the
+                answer. Errors are passed to *error_callback*, if given, or logged otherwise.
+                Defaults to False.
+
+            error_callback (``Callable``, *optional*):
+                A function (or coroutine function) to be called with the client and the exception in case the request
+                fails in fire-and-forget mode.
+
         Returns:
-            ``bool``: On success, True is returned.
+            ``bool``: On success, True is returned. In fire-and-forget mode, None is returned right away.
 
         Raises:
             ValueError: In case the provided string is not a valid chat action.
@@ -81,5 +92,7 @@ class SendChatAction:
                 peer=await self.resolve_peer(chat_id),
                 action=action
             ),
-            business_connection_id=business_connection_id
+            business_connection_id=business_connection_id,
+            fire_and_forget=fire_and_forget,
+            error_callback=error_callback
         )
@@ -16,7 +16,7 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from typing import Union, List
+from typing import Union, List, Callable
 
 import pyrogram
 from pyrogram import raw
@@ -27,6 +27,8 @@ class ViewMessages:
         self: "pyrogram.Client",
         chat_id: Union[int, str],
         message_id: Union[int, List[int]],
+        fire_and_forget: bool = False,
+        error_callback: Callable = None
     ) -> bool:
         """Increment message views counter.
 
@@ -39,8 +41,17 @@ class ViewMessages:
             message_id (``int`` | List of ``int``):
                 Identifier or list of message identifiers of the target message.
 
+            fire_and_forget (``bool``, *optional*):
+                Pass True to send the request in the background and return immediately, without waiting for the
+                answer. Errors are passed to *error_callback*, if given, or logged otherwise.
+                Defaults to False.
+
+            error_callback (``Callable``, *optional*):
+                A function (or coroutine function) to be called with the client and the exception in case the request
+                fails in fire-and-forget mode.
+
         Returns:
-            ``bool``: On success, True is returned.
+            ``bool``: On success, True is returned. In fire-and-forget mode, None is returned right away.
 
         Example:
             .. code-block:: python
@@ -55,7 +66,9 @@ class ViewMessages:
                 peer=await self.resolve_peer(chat_id),
                 id=ids,
                 increment=True
-            )
+            ),
+            fire_and_forget=fire_and_forget,
+            error_callback=error_callback
         )
 
-        return bool(r)
+        return None if fire_and_forget else bool(r)
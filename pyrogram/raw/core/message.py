@@ -17,7 +17,7 @@
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from io import BytesIO
-from typing import Any
+from typing import Any, Optional
 
 from .primitives.int import Int, Long
 from .tl_object import TLObject
@@ -26,16 +26,19 @@ from .tl_object import TLObject
 class Message(TLObject):
     ID = 0x5BB8E511  # hex(crc32(b"message msg_id:long seqno:int bytes:int body:Object = Message"))
 
-    __slots__ = ["msg_id", "seq_no", "length", "body"]
+    __slots__ = ["msg_id", "seq_no", "length", "body", "_data"]
 
     QUALNAME = "Message"
 
-    def __init__(self, body: TLObject, msg_id: int, seq_no: int, length: int):
+    def __init__(self, body: TLObject, msg_id: int, seq_no: int, length: int, data: Optional[bytes] = None):
         self.msg_id = msg_id
         self.seq_no = seq_no
         self.length = length
         self.body = body
 
+        # The already serialized body, if any, so that it doesn't need to be written again
+        self._data = data
+
     @staticmethod
     def read(data: BytesIO, *args: Any) -> "Message":
         msg_id = Long.read(data)
@@ -51,6 +54,6 @@ class Message(TLObject):
         b.write(Long(self.msg_id))
         b.write(Int(self.seq_no))
         b.write(Int(self.length))
-        b.write(self.body.write())
+        b.write(self._data if self._data is not None else self.body.write())
 
         return b.getvalue()
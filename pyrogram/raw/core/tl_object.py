@@ -45,7 +45,7 @@ class TLObject:
             **{
                 attr: getattr(obj, attr)
                 for attr in obj.__slots__
-                if getattr(obj, attr) is not None
+                if not attr.startswith("_") and getattr(obj, attr) is not None
             }
         }
 
@@ -61,7 +61,7 @@ class TLObject:
             ", ".join(
                 f"{attr}={repr(getattr(self, attr))}"
                 for attr in self.__slots__
-                if getattr(self, attr) is not None
+                if not attr.startswith("_") and getattr(self, attr) is not None
             )
         )
 
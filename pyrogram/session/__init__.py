@@ -17,4 +17,8 @@
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from .auth import Auth
+from .flood_gate import FloodGate
+from .metrics import Metrics
+from .rate_limiter import RateLimiter
 from .session import Session
+from .session_pool import SessionPool
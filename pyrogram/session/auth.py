@@ -50,16 +50,20 @@ class Auth:
         self.proxy = client.proxy
         self.connection_factory = client.connection_factory
         self.protocol_factory = client.protocol_factory
+        self.dc_options = client.dc_options
+        self.crypto_executor = client.crypto_executor
 
         self.connection: Optional[Connection] = None
 
     @staticmethod
     def pack(data: TLObject) -> bytes:
+        data = data.write()
+
         return (
             bytes(8)
             + Long(MsgId())
-            + Int(len(data.write()))
-            + data.write()
+            + Int(len(data))
+            + data
         )
 
     @staticmethod
@@ -90,7 +94,9 @@ class Auth:
                 ipv6=self.ipv6,
                 proxy=self.proxy,
                 media=False,
-                protocol_factory=self.protocol_factory
+                protocol_factory=self.protocol_factory,
+                addresses=self.dc_options.candidates(self.dc_id, self.test_mode, self.ipv6, False),
+                crypto_executor=self.crypto_executor
             )
 
             try:
@@ -0,0 +1,86 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import math
+import time
+from typing import Dict, Optional, Tuple
+
+from pyrogram.errors import FloodWait
+
+
+class FloodGate:
+    """Keeps track of the FloodWait errors received by a client, so that concurrent callers wait together.
+
+    Gates are keyed by function name (e.g.: "messages.SendMessage") and by the id of the peer the function acts on,
+    if any. Once a FloodWait is received for a key, every later call with the same key waits locally until it expires
+    instead of reaching the server and possibly extending the penalty.
+    """
+
+    def __init__(self):
+        # (function name, peer id) -> monotonic time at which the gate opens again
+        self.gates: Dict[Tuple[str, Optional[int]], float] = {}
+
+    def __len__(self) -> int:
+        return len(self.gated)
+
+    @property
+    def gated(self) -> Dict[Tuple[str, Optional[int]], float]:
+        """The keys currently gated, along with the seconds left before they are open again."""
+        now = time.monotonic()
+
+        for key in [key for key, until in self.gates.items() if until <= now]:
+            del self.gates[key]
+
+        return {key: until - now for key, until in self.gates.items()}
+
+    def remaining(self, name: str, peer_id: Optional[int] = None) -> float:
+        until = self.gates.get((name, peer_id))
+
+        if until is None:
+            return 0
+
+        remaining = until - time.monotonic()
+
+        if remaining <= 0:
+            self.gates.pop((name, peer_id), None)
+            return 0
+
+        return remaining
+
+    def close(self, name: str, peer_id: Optional[int], value: float):
+        """Gate a key for ``value`` seconds, unless it is already gated for longer."""
+        key = (name, peer_id)
+        self.gates[key] = max(self.gates.get(key, 0), time.monotonic() + value)
+
+    async def wait(self, name: str, peer_id: Optional[int] = None, sleep_threshold: float = 10):
+        """Wait for the gate of a key to open.
+
+        Raises:
+            FloodWait: In case the gate stays closed for longer than ``sleep_threshold`` seconds.
+        """
+        while True:
+            remaining = self.remaining(name, peer_id)
+
+            if remaining <= 0:
+                return
+
+            if remaining > sleep_threshold >= 0:
+                raise FloodWait(value=math.ceil(remaining), rpc_name=name)
+
+            await asyncio.sleep(remaining)
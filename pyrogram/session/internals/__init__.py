@@ -17,5 +17,10 @@
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from .data_center import DataCenter
+from .dc_options import DcOptions
+from .deadlines import Deadlines
+from .in_flight_window import InFlightWindow
 from .msg_factory import MsgFactory
 from .msg_id import MsgId
+from .replay_window import ReplayWindow
+from .server_salts import ServerSalts
@@ -0,0 +1,113 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from typing import List, Optional, Tuple
+
+from pyrogram import raw
+from .data_center import DataCenter
+
+
+class DcOptions:
+    """Keeps the data center endpoints advertised by help.GetConfig and ranks them by connect latency.
+
+    https://core.telegram.org/api/datacenter
+    """
+
+    # Latency recorded for endpoints that failed to connect, in seconds, these rank after the unmeasured ones
+    FAILURE_LATENCY = 60.0
+    # Relative change of a measured latency below which it's not worth saving again
+    LATENCY_TOLERANCE = 0.25
+
+    def __init__(self):
+        # List of [dc_id, ip_address, port, is_ipv6, is_media, latency] entries, the latency is None until measured
+        self.options: List[list] = []
+        self.loaded = False
+        # Whether the endpoints or their latencies changed enough since they were last loaded or saved
+        self.changed = False
+
+    def __len__(self) -> int:
+        return len(self.options)
+
+    def load(self, options: List[Tuple[int, str, int, bool, bool, Optional[float]]]):
+        self.options = [list(option) for option in options]
+        self.loaded = True
+        self.changed = False
+
+    def update(self, dc_options: List["raw.base.DcOption"]):
+        # CDN endpoints belong to a separate config and obfuscated-only ones need a secret, skip both
+        latencies = {(option[1], option[2]): option[5] for option in self.options}
+
+        options = [
+            [o.id, o.ip_address, o.port, bool(o.ipv6), bool(o.media_only), latencies.get((o.ip_address, o.port))]
+            for o in dc_options
+            if not o.cdn and not o.tcpo_only
+        ]
+
+        if options != self.options:
+            self.options = options
+            self.changed = True
+
+    def dump(self) -> List[Tuple[int, str, int, bool, bool, Optional[float]]]:
+        return [tuple(option) for option in self.options]
+
+    def report(self, address: Tuple[str, int], latency: Optional[float]):
+        """Record the connect latency of an endpoint, or None if connecting to it failed."""
+        latency = self.FAILURE_LATENCY if latency is None else latency
+
+        for option in self.options:
+            if (option[1], option[2]) == address:
+                previous = option[5]
+                option[5] = latency
+
+                if previous is None or abs(latency - previous) > previous * self.LATENCY_TOLERANCE:
+                    self.changed = True
+
+    def candidates(self, dc_id: int, test_mode: bool, ipv6: bool, media: bool) -> List[Tuple[str, int]]:
+        """Get the endpoints to try for a data center, best first.
+
+        Endpoints with a measured latency come first, fastest first. The unmeasured ones follow, preferring media-only
+        endpoints for media sessions and IPv6 endpoints when IPv6 is enabled, then the ones that failed to connect.
+        The built-in address is always included as the last resort.
+        """
+        def rank(option: list) -> tuple:
+            latency = option[5]
+
+            if latency is None:
+                group = 1
+            elif latency >= self.FAILURE_LATENCY:
+                group = 2
+            else:
+                group = 0
+
+            return group, latency or 0, media and not option[4], ipv6 and not option[3]
+
+        options = sorted(
+            (
+                option for option in self.options
+                if option[0] == dc_id and (ipv6 or not option[3]) and (media or not option[4])
+            ),
+            key=rank
+        )
+
+        candidates = [(option[1], option[2]) for option in options]
+        fallback = DataCenter(dc_id, test_mode, ipv6, media)
+
+        if fallback not in candidates:
+            candidates.append(fallback)
+
+        return candidates
@@ -0,0 +1,86 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import heapq
+from itertools import count
+from typing import List, Optional, Tuple
+
+
+class Deadlines:
+    """Expires pending futures once their deadline is reached.
+
+    All deadlines are kept in a heap and a single timer handle, scheduled with ``loop.call_at`` for the earliest one,
+    is shared among them. Deadlines closer than ``resolution`` seconds are expired together in the same batch.
+    Expired futures get ``None`` as result.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, resolution: float = 0.05):
+        self.loop = loop
+        self.resolution = resolution
+
+        self.heap: List[Tuple[float, int, asyncio.Future]] = []
+        self.counter = count()
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def add(self, future: asyncio.Future, timeout: float):
+        deadline = self.loop.time() + timeout
+
+        heapq.heappush(self.heap, (deadline, next(self.counter), future))
+
+        if self.timer is None or deadline + self.resolution < self.timer.when():
+            self.schedule()
+
+    def schedule(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+        # Drop futures that were resolved in the meantime, there's no need to wake up for them
+        while self.heap and self.heap[0][2].done():
+            heapq.heappop(self.heap)
+
+        if self.heap:
+            self.timer = self.loop.call_at(self.heap[0][0] + self.resolution, self.expire)
+
+    def expire(self):
+        self.timer = None
+        now = self.loop.time()
+
+        while self.heap and self.heap[0][0] <= now:
+            future = heapq.heappop(self.heap)[2]
+
+            if not future.done():
+                future.set_result(None)
+
+        self.schedule()
+
+    def clear(self):
+        """Expire all the pending futures right away, without waiting for their deadline."""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+        for _, _, future in self.heap:
+            if not future.done():
+                future.set_result(None)
+
+        self.heap.clear()
@@ -0,0 +1,72 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import heapq
+from itertools import count
+from typing import List, Tuple
+
+
+class InFlightWindow:
+    """Limits the amount of requests in flight.
+
+    When the window is full, waiting requests are admitted as soon as slots free up, lowest priority value first and
+    in arrival order among requests with the same priority.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.active = 0
+
+        self.waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self.counter = count()
+
+    def __len__(self) -> int:
+        return self.active
+
+    @property
+    def waiting(self) -> int:
+        return sum(not future.done() for _, _, future in self.waiters)
+
+    async def acquire(self, priority: int):
+        # Requests only wait when the window is full, so there's nobody to overtake when a slot is free
+        if self.active < self.size:
+            self.active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, (priority, next(self.counter), future))
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            # The slot was granted right before the waiter got cancelled, pass it on
+            if future.done() and not future.cancelled():
+                self.release()
+
+            raise
+
+    def release(self):
+        self.active -= 1
+
+        while self.waiters and self.active < self.size:
+            future = heapq.heappop(self.waiters)[2]
+
+            if not future.done():
+                self.active += 1
+                future.set_result(None)
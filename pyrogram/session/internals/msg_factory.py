@@ -16,23 +16,61 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from pyrogram.raw.core import Message, MsgContainer, TLObject
+from gzip import compress
+from typing import Optional
+
+from pyrogram.raw.core import Message, MsgContainer, TLObject, GzipPacked, Int, Bytes
 from pyrogram.raw.functions import Ping
+from pyrogram.raw.functions.upload import SaveFilePart, SaveBigFilePart
 from pyrogram.raw.types import MsgsAck, HttpWait
 from .msg_id import MsgId
 from .seq_no import SeqNo
 
 not_content_related = (Ping, HttpWait, MsgsAck, MsgContainer)
 
+# File parts are already compressed most of the times, don't waste time on them
+not_compressible = (SaveFilePart, SaveBigFilePart)
+
 
 class MsgFactory:
-    def __init__(self):
+    GZIP_LEVEL = 6
+
+    def __init__(self, gzip_threshold: Optional[int] = None):
         self.seq_no = SeqNo()
 
+        # Bodies bigger than this (in bytes) are sent wrapped in GzipPacked whenever that makes them smaller
+        self.gzip_threshold = gzip_threshold
+        self.gzip_packed_count = 0
+        self.gzip_bytes_saved = 0
+
     def __call__(self, body: TLObject) -> Message:
+        data = body.write()
+        is_content_related = not isinstance(body, not_content_related)
+
+        if (
+            self.gzip_threshold is not None
+            and len(data) > self.gzip_threshold
+            and is_content_related
+            and not isinstance(body, not_compressible)
+            and not isinstance(getattr(body, "query", None), not_compressible)
+        ):
+            data = self.gzip(data)
+
         return Message(
             body,
             MsgId(),
-            self.seq_no(not isinstance(body, not_content_related)),
-            len(body)
+            self.seq_no(is_content_related),
+            len(data),
+            data
         )
+
+    def gzip(self, data: bytes) -> bytes:
+        packed = Int(GzipPacked.ID, False) + Bytes(compress(data, self.GZIP_LEVEL))
+
+        if len(packed) >= len(data):
+            return data
+
+        self.gzip_packed_count += 1
+        self.gzip_bytes_saved += len(data) - len(packed)
+
+        return packed
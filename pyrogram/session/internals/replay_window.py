@@ -0,0 +1,58 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections import deque
+
+
+class ReplayWindow:
+    """Keeps track of the most recent incoming msg_ids with constant-time lookups and eviction.
+
+    https://core.telegram.org/mtproto/security_guidelines#checking-msg-id
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+
+        self.ids = set()
+        self.order = deque()
+
+        # Any msg_id below this value is either older than all the stored ones or has already been evicted
+        self.lowest = 0
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __contains__(self, msg_id: int) -> bool:
+        return msg_id in self.ids
+
+    def add(self, msg_id: int):
+        if not self.order:
+            self.lowest = max(self.lowest, msg_id)
+
+        if len(self.order) >= self.size:
+            evicted = self.order.popleft()
+            self.ids.discard(evicted)
+            self.lowest = max(self.lowest, evicted + 1)
+
+        self.ids.add(msg_id)
+        self.order.append(msg_id)
+
+    def clear(self):
+        self.ids.clear()
+        self.order.clear()
+        self.lowest = 0
@@ -0,0 +1,67 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import time
+from typing import List, Optional, Tuple
+
+from pyrogram.raw.core import FutureSalts
+
+
+class ServerSalts:
+    """Keeps the server salts obtained with GetFutureSalts and picks the one valid at the current server time.
+
+    https://core.telegram.org/mtproto/service_messages#request-for-several-future-salts
+    """
+
+    def __init__(self):
+        # Sorted list of (valid_since, valid_until, salt) tuples
+        self.salts: List[Tuple[int, int, int]] = []
+
+        # Difference between the server and the local clock, in seconds
+        self.time_offset = 0
+
+    def __len__(self) -> int:
+        return len(self.salts)
+
+    def now(self) -> float:
+        return time.time() + self.time_offset
+
+    def load(self, salts: List[Tuple[int, int, int]]):
+        self.salts = sorted(salts)
+
+    def update(self, future_salts: FutureSalts):
+        self.time_offset = future_salts.now - time.time()
+        self.salts = sorted((s.valid_since, s.valid_until, s.salt) for s in future_salts.salts)
+
+    def current(self) -> Optional[int]:
+        now = self.now()
+
+        while self.salts and self.salts[0][1] <= now:
+            self.salts.pop(0)
+
+        if self.salts and self.salts[0][0] <= now:
+            return self.salts[0][2]
+
+        return None
+
+    def remaining(self) -> float:
+        """Seconds of validity left before the last known salt expires."""
+        if not self.salts:
+            return 0
+
+        return self.salts[-1][1] - self.now()
@@ -0,0 +1,189 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+from bisect import bisect_left
+from typing import Callable, Dict, Optional, Any, Iterable
+
+log = logging.getLogger(__name__)
+
+
+class Histogram:
+    """Counts observed durations (in seconds) into fixed buckets."""
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, float("inf"))
+
+    def __init__(self):
+        self.counts = [0] * len(self.BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def merge(self, other: "Histogram"):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Estimate a percentile as the upper bound of the bucket it falls in."""
+        target = self.count * p / 100
+        seen = 0
+
+        for bound, count in zip(self.BUCKETS, self.counts):
+            seen += count
+
+            if count and seen >= target:
+                return min(bound, self.max)
+
+        return 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+            "buckets": dict(zip(self.BUCKETS, self.counts))
+        }
+
+
+class Metrics:
+    """Telemetry of a session, or of all the sessions of a client when aggregated with :meth:`merge`.
+
+    Parameters:
+        callback (``Callable``, *optional*):
+            A function called on every observation with the metric name, its value and the name of the raw function
+            involved, if any. Useful to forward metrics to an external monitoring system. It runs on the event loop,
+            so it must be fast and must not block.
+    """
+
+    def __init__(self, callback: Optional[Callable[[str, float, Optional[str]], Any]] = None):
+        self.callback = callback
+
+        # Response times per raw function (e.g.: "messages.SendMessage")
+        self.latency: Dict[str, Histogram] = {}
+        # Round trip times measured with pings
+        self.rtt = Histogram()
+
+        self.requests = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.packets_sent = 0
+        self.packets_received = 0
+        self.reconnects = 0
+        self.switchovers = 0
+        self.flood_waits = 0
+        self.flood_wait_time = 0
+        self.crypto_time = 0.0
+
+    def emit(self, name: str, value: float, query: Optional[str] = None):
+        if self.callback is None:
+            return
+
+        # The callback runs inside the session workers, a failing one must not break them
+        try:
+            self.callback(name, value, query)
+        except Exception as e:
+            log.exception(e)
+
+    def observe_request(self, query: str, latency: float):
+        self.requests += 1
+
+        if query not in self.latency:
+            self.latency[query] = Histogram()
+
+        self.latency[query].observe(latency)
+        self.emit("latency", latency, query)
+
+    def observe_rtt(self, rtt: float):
+        self.rtt.observe(rtt)
+        self.emit("rtt", rtt)
+
+    def observe_sent(self, size: int):
+        self.packets_sent += 1
+        self.bytes_sent += size
+        self.emit("bytes_sent", size)
+
+    def observe_received(self, size: int):
+        self.packets_received += 1
+        self.bytes_received += size
+        self.emit("bytes_received", size)
+
+    def observe_flood_wait(self, query: str, value: int):
+        self.flood_waits += 1
+        self.flood_wait_time += value
+        self.emit("flood_wait", value, query)
+
+    def count(self, name: str, query: Optional[str] = None):
+        """Increase one of the plain counters (e.g.: "timeouts", "errors", "retries", "reconnects")."""
+        setattr(self, name, getattr(self, name) + 1)
+        self.emit(name, 1, query)
+
+    @classmethod
+    def merge(cls, metrics: Iterable["Metrics"]) -> "Metrics":
+        """Aggregate multiple metrics into a new object."""
+        merged = cls()
+
+        for m in metrics:
+            for query, histogram in m.latency.items():
+                merged.latency.setdefault(query, Histogram()).merge(histogram)
+
+            merged.rtt.merge(m.rtt)
+
+            for name in (
+                "requests", "timeouts", "errors", "retries", "bytes_sent", "bytes_received", "packets_sent",
+                "packets_received", "reconnects", "switchovers", "flood_waits", "flood_wait_time", "crypto_time"
+            ):
+                setattr(merged, name, getattr(merged, name) + getattr(m, name))
+
+        return merged
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "packets_sent": self.packets_sent,
+            "packets_received": self.packets_received,
+            "reconnects": self.reconnects,
+            "switchovers": self.switchovers,
+            "flood_waits": self.flood_waits,
+            "flood_wait_time": self.flood_wait_time,
+            "crypto_time": self.crypto_time,
+            "rtt": self.rtt.to_dict(),
+            "latency": {query: histogram.to_dict() for query, histogram in self.latency.items()}
+        }
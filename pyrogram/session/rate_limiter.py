@@ -0,0 +1,181 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import time
+from fnmatch import fnmatchcase
+from typing import Dict, List, Optional, Tuple
+
+from pyrogram import utils
+from pyrogram.raw.core import TLObject
+
+
+class TokenBucket:
+    """Allows ``rate`` calls per second with bursts of up to ``burst`` calls.
+
+    Calls are never rejected: each one reserves a token, going into debt if needed, and is told how long to wait for
+    it. This queues the excess calls in the order they arrived.
+    """
+
+    # A FloodWait slows the bucket down by this factor, then the rate grows back linearly within RECOVERY_TIME seconds
+    FLOOD_BACKOFF = 0.5
+    MIN_RATE_FACTOR = 0.05
+    RECOVERY_TIME = 600
+
+    def __init__(self, rate: float, burst: int):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        elapsed = now - self.updated
+        self.updated = now
+
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + elapsed * self.base_rate / self.RECOVERY_TIME)
+
+    def reserve(self) -> float:
+        """Take a token and return the seconds to wait before using it."""
+        self.refill()
+        self.tokens -= 1
+
+        return max(0.0, -self.tokens / self.rate)
+
+    def flood_wait(self, value: float):
+        """Slow down after the server asked to wait ``value`` seconds, blocking new calls meanwhile."""
+        self.refill()
+        self.rate = max(self.base_rate * self.MIN_RATE_FACTOR, self.rate * self.FLOOD_BACKOFF)
+        self.tokens = min(self.tokens, -value * self.rate)
+
+    @property
+    def is_idle(self) -> bool:
+        self.refill()
+
+        return self.tokens >= self.burst and self.rate >= self.base_rate
+
+
+class RateLimiter:
+    """Paces outgoing requests to stay within Telegram's limits instead of running into FloodWait errors.
+
+    Limits are given as ``{pattern: (rate, burst)}`` dictionaries, where *pattern* is matched against the name of the
+    raw function (e.g.: "messages.SendMessage") and accepts shell-style wildcards, *rate* is the amount of calls per
+    second and *burst* the amount of calls allowed in a row before pacing them. All the functions matching the same
+    pattern share the same budget.
+
+    Parameters:
+        limits (``dict``, *optional*):
+            Budgets shared by all the calls of the matching functions.
+            Defaults to about 30 messages per second in total, the broadcasting limit for bots.
+
+        peer_limits (``dict``, *optional*):
+            Budgets applied to each chat separately, for functions that act on a peer.
+            Defaults to about one message per second in the same chat.
+
+    Example:
+        .. code-block:: python
+
+            from pyrogram import Client
+            from pyrogram.session import RateLimiter
+
+            app = Client("my_bot", rate_limiter=RateLimiter(peer_limits={"messages.Send*": (20 / 60, 5)}))
+    """
+
+    LIMITS = {
+        "messages.Send*": (30, 30),
+        "messages.ForwardMessages": (30, 30)
+    }
+
+    PEER_LIMITS = {
+        "messages.Send*": (1, 3),
+        "messages.ForwardMessages": (1, 3)
+    }
+
+    # Idle per-chat buckets are dropped once there are more than this
+    MAX_PEER_BUCKETS = 10000
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Tuple[float, int]]] = None,
+        peer_limits: Optional[Dict[str, Tuple[float, int]]] = None
+    ):
+        self.limits = self.LIMITS if limits is None else limits
+        self.peer_limits = self.PEER_LIMITS if peer_limits is None else peer_limits
+
+        self.buckets: Dict[str, TokenBucket] = {
+            pattern: TokenBucket(*limit)
+            for pattern, limit in self.limits.items()
+        }
+        self.peer_buckets: Dict[Tuple[str, int], TokenBucket] = {}
+
+        # Function name -> (matching limits patterns, matching peer_limits patterns)
+        self.patterns: Dict[str, Tuple[List[str], List[str]]] = {}
+
+    def match(self, name: str) -> Tuple[List[str], List[str]]:
+        if name not in self.patterns:
+            self.patterns[name] = (
+                [pattern for pattern in self.limits if fnmatchcase(name, pattern)],
+                [pattern for pattern in self.peer_limits if fnmatchcase(name, pattern)]
+            )
+
+        return self.patterns[name]
+
+    def get_buckets(self, query: TLObject) -> List[TokenBucket]:
+        # The budgets are the ones of the actual function, whichever invoke wrappers it's sent in
+        query = utils.unwrap_query(query)
+        name = ".".join(query.QUALNAME.split(".")[1:])
+        patterns, peer_patterns = self.match(name)
+
+        buckets = [self.buckets[pattern] for pattern in patterns]
+
+        if peer_patterns:
+            peer_id = utils.get_query_peer_id(query)
+
+            if peer_id is not None:
+                if len(self.peer_buckets) > self.MAX_PEER_BUCKETS:
+                    self.prune()
+
+                for pattern in peer_patterns:
+                    key = (pattern, peer_id)
+
+                    if key not in self.peer_buckets:
+                        self.peer_buckets[key] = TokenBucket(*self.peer_limits[pattern])
+
+                    buckets.append(self.peer_buckets[key])
+
+        return buckets
+
+    def prune(self):
+        for key in [key for key, bucket in self.peer_buckets.items() if bucket.is_idle]:
+            del self.peer_buckets[key]
+
+    async def acquire(self, query: TLObject):
+        """Wait until the query can be sent without exceeding its budgets."""
+        delay = max((bucket.reserve() for bucket in self.get_buckets(query)), default=0)
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def flood_wait(self, query: TLObject, value: float):
+        """Learn from a FloodWait received for the query."""
+        for bucket in self.get_buckets(query):
+            bucket.flood_wait(value)
@@ -17,15 +17,16 @@
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 import asyncio
-import bisect
 import logging
 import os
+import time
+from collections import deque
 from hashlib import sha1
 from io import BytesIO
-from typing import Optional
+from typing import Optional, List, Tuple, Callable, Any, Dict
 
 import pyrogram
-from pyrogram import raw
+from pyrogram import raw, utils, enums
 from pyrogram.connection import Connection
 from pyrogram.crypto import mtproto
 from pyrogram.errors import (
@@ -33,27 +34,70 @@ from pyrogram.errors import (
     SecurityCheckMismatch, Unauthorized
 )
 from pyrogram.raw.all import layer
-from pyrogram.raw.core import TLObject, MsgContainer, Int, FutureSalts
-from .internals import MsgId, MsgFactory
+from pyrogram.raw.core import TLObject, Message, MsgContainer, Int, FutureSalts
+from .internals import MsgId, MsgFactory, ReplayWindow, ServerSalts, Deadlines, InFlightWindow
+from .metrics import Metrics
 
 log = logging.getLogger(__name__)
 
 
-class Result:
-    def __init__(self):
-        self.value = None
-        self.event = asyncio.Event()
-
-
 class Session:
     START_TIMEOUT = 2
     WAIT_TIMEOUT = 15
     SLEEP_THRESHOLD = 10
     MAX_RETRIES = 10
-    ACKS_THRESHOLD = 10
+    ACKS_FLUSH_DELAY = 0.5
     PING_INTERVAL = 5
     STORED_MSG_IDS_MAX_SIZE = 1000 * 2
 
+    # Outgoing messages queued within this window are packed together in a single MsgContainer
+    SEND_BATCH_WINDOW = 0
+    MAX_CONTAINER_MESSAGES = 100
+    MAX_CONTAINER_LENGTH = 1044456 - 8
+
+    # Incoming packets are decrypted concurrently by a fixed pool of workers and dispatched in order
+    DECODE_WORKERS = 4
+    PACKETS_QUEUE_SIZE = 64
+
+    # Maximum amount of update batches handled at the same time, further ones wait in the updates queue
+    MAX_UPDATES_TASKS = 64
+
+    # Packets smaller than this (in bytes) are encrypted and decrypted directly on the event loop, since a thread
+    # hop costs more than running AES-IGE on them. Bigger ones are offloaded to the crypto executor.
+    CRYPTO_INLINE_THRESHOLD = 1024
+
+    # Maximum amount of requests waiting for an answer at the same time, further requests wait for a free slot
+    MAX_IN_FLIGHT = 1024
+
+    # Future server salts are prefetched with GetFutureSalts and rotated locally as they become valid, so that
+    # requests don't bounce back with BadServerSalt whenever the current salt expires
+    SALTS_COUNT = 64
+    SALTS_REFRESH_THRESHOLD = 3600 * 6
+    SALTS_CHECK_INTERVAL = 60
+
+    # Read-only requests that may be hedged: sent once more when no answer arrives within the given percentile of the
+    # recent latencies of these same functions, keeping the first answer and dropping the other. Other requests (e.g.:
+    # file parts, differences) are left out of the samples, they would only push the percentile up
+    HEDGE_FUNCTIONS = (
+        raw.functions.messages.GetMessages,
+        raw.functions.channels.GetMessages,
+        raw.functions.users.GetUsers,
+        raw.functions.users.GetFullUser,
+        raw.functions.channels.GetParticipants,
+        raw.functions.channels.GetParticipant
+    )
+    HEDGE_PERCENTILE = 95
+    HEDGE_MIN_DELAY = 0.1
+    HEDGE_SAMPLES = 100
+    HEDGE_MIN_SAMPLES = 20
+
+    # Requests bigger than this (in bytes) are compressed with gzip, if enabled and worth it
+    GZIP_THRESHOLD = 512
+
+    # Requests still waiting for an answer when the connection drops are sent again on the new one, as long as their
+    # msg_id is recent enough for the server to accept it (up to 300 seconds in the past)
+    RESEND_MAX_AGE = 240
+
     TRANSPORT_ERRORS = {
         404: "auth key not found",
         429: "transport flood",
@@ -81,63 +125,148 @@ class Session:
         self.auth_key_id = sha1(auth_key).digest()[-8:]
 
         self.session_id = os.urandom(8)
-        self.msg_factory = MsgFactory()
+        self.msg_factory = MsgFactory(self.GZIP_THRESHOLD if client.gzip_requests else None)
 
         self.salt = 0
+        self.server_salts = ServerSalts()
+
+        self.crypto_worker = client.crypto_executor.pin()
+        self.inline_crypto_count = 0
+        self.offloaded_crypto_count = 0
 
+        # Acks ride along with outgoing messages and are only sent on their own when the session stays idle
         self.pending_acks = set()
+        self.acks_timer: Optional[asyncio.TimerHandle] = None
 
-        self.results = {}
+        # Pending requests, resolved with their response or with None once their deadline expires
+        self.results: Dict[int, asyncio.Future] = {}
 
-        self.stored_msg_ids = []
+        # Sent requests waiting for an answer, and those among them the server acknowledged to have received
+        self.requests: Dict[int, Message] = {}
+        self.acked_requests = set()
+
+        # Maps the msg_id of each sent container to the msg_ids of the messages it carries
+        self.containers = {}
+
+        self.stored_msg_ids = ReplayWindow(self.STORED_MSG_IDS_MAX_SIZE)
+
+        # One queue of messages to send for each priority, higher priority queues are drained first
+        self.outgoing: List[deque] = [deque() for _ in enums.RequestPriority]
+        self.outgoing_event = asyncio.Event()
+        self.send_task = None
 
         self.ping_task = None
         self.ping_task_event = asyncio.Event()
 
+        self.salt_task = None
+
+        # Latencies of the latest answered requests that may be hedged, in seconds
+        self.hedge_latencies: deque = deque(maxlen=self.HEDGE_SAMPLES)
+
+        self.metrics = Metrics(client.metrics_callback)
+
+        # The id and the time of the last ping sent by the ping worker, used to measure the round trip time once the
+        # pong arrives. Its ids start from 1: pings with id 0 (connection checks, standby keepalives) aren't measured
+        self.ping_id = 0
+        self.ping_sent_at = 0.0
+
         self.recv_task = None
 
+        # A second connection kept connected and initialized, ready to take over as soon as the primary one drops
+        self.standby: Optional[Connection] = None
+        self.standby_recv_task = None
+        self.standby_task = None
+
+        self.decode_queue = asyncio.Queue(self.PACKETS_QUEUE_SIZE)
+        self.decode_tasks = []
+
+        self.dispatch_queue = asyncio.Queue(self.PACKETS_QUEUE_SIZE)
+        self.dispatch_task = None
+
+        self.updates_queue = asyncio.Queue()
+        self.updates_task = None
+
+        # Updates being handled, each in its own task chained to the previous one (see Client.handle_updates)
+        self.updates_tasks = set()
+        self.updates_semaphore = asyncio.Semaphore(self.MAX_UPDATES_TASKS)
+
         self.is_started = asyncio.Event()
 
         self.loop = asyncio.get_event_loop()
 
+        self.deadlines = Deadlines(self.loop)
+        self.window = InFlightWindow(self.MAX_IN_FLIGHT)
+
+    def create_connection(self) -> Connection:
+        return self.client.connection_factory(
+            dc_id=self.dc_id,
+            test_mode=self.test_mode,
+            ipv6=self.client.ipv6,
+            proxy=self.client.proxy,
+            media=self.is_media,
+            protocol_factory=self.client.protocol_factory,
+            addresses=self.client.dc_options.candidates(
+                self.dc_id,
+                self.test_mode,
+                self.client.ipv6,
+                self.is_media
+            ),
+            crypto_executor=self.client.crypto_executor
+        )
+
+    async def init_connection_query(self) -> TLObject:
+        return raw.functions.InvokeWithLayer(
+            layer=layer,
+            query=raw.functions.InitConnection(
+                api_id=await self.client.storage.api_id(),
+                app_version=self.client.app_version,
+                device_model=self.client.device_model,
+                system_version=self.client.system_version,
+                system_lang_code=self.client.system_lang_code,
+                lang_pack=self.client.lang_pack,
+                lang_code=self.client.lang_code,
+                query=raw.functions.help.GetConfig(),
+                params=self.client.init_connection_params,
+            )
+        )
+
     async def start(self):
         while True:
-            self.connection = self.client.connection_factory(
-                dc_id=self.dc_id,
-                test_mode=self.test_mode,
-                ipv6=self.client.ipv6,
-                proxy=self.client.proxy,
-                media=self.is_media,
-                protocol_factory=self.client.protocol_factory
-            )
+            await self.load_dc_options()
+
+            self.connection = self.create_connection()
 
             try:
+                await self.load_salts()
+
                 await self.connection.connect()
 
-                self.recv_task = self.loop.create_task(self.recv_worker())
+                self.decode_tasks = [self.loop.create_task(self.decode_worker()) for _ in range(self.DECODE_WORKERS)]
+                self.dispatch_task = self.loop.create_task(self.dispatch_worker())
 
-                await self.send(raw.functions.Ping(ping_id=0), timeout=self.START_TIMEOUT)
+                if self.updates_task is None:
+                    self.updates_task = self.loop.create_task(self.updates_worker())
+
+                self.recv_task = self.loop.create_task(self.recv_worker(self.connection))
+                self.send_task = self.loop.create_task(self.send_worker())
+
+                await self.send(raw.functions.Ping(ping_id=0), timeout=self.START_TIMEOUT, bypass_window=True)
 
                 if not self.is_cdn:
-                    await self.send(
-                        raw.functions.InvokeWithLayer(
-                            layer=layer,
-                            query=raw.functions.InitConnection(
-                                api_id=await self.client.storage.api_id(),
-                                app_version=self.client.app_version,
-                                device_model=self.client.device_model,
-                                system_version=self.client.system_version,
-                                system_lang_code=self.client.system_lang_code,
-                                lang_pack=self.client.lang_pack,
-                                lang_code=self.client.lang_code,
-                                query=raw.functions.help.GetConfig(),
-                                params=self.client.init_connection_params,
-                            )
-                        ),
-                        timeout=self.START_TIMEOUT
+                    config = await self.send(
+                        await self.init_connection_query(),
+                        timeout=self.START_TIMEOUT,
+                        bypass_window=True
                     )
 
+                    await self.update_dc_options(self.connection, config)
+
+                self.resend_requests()
+
                 self.ping_task = self.loop.create_task(self.ping_worker())
+                self.salt_task = self.loop.create_task(self.salt_worker())
+
+                self.ensure_standby()
 
                 log.info("Session initialized: Layer %s", layer)
                 log.info("Device: %s - %s", self.client.device_model, self.client.app_version)
@@ -146,7 +275,8 @@ class Session:
                 await self.stop()
                 raise e
             except (OSError, RPCError):
-                await self.stop()
+                # Another attempt follows: pending requests and updates must survive it, like for a restart
+                await self.stop(restart=True)
             except Exception as e:
                 await self.stop()
                 raise e
@@ -157,7 +287,7 @@ class Session:
 
         log.info("Session started")
 
-    async def stop(self):
+    async def stop(self, restart: bool = False):
         self.is_started.clear()
 
         self.stored_msg_ids.clear()
@@ -169,10 +299,59 @@ class Session:
 
         self.ping_task_event.clear()
 
+        if self.salt_task is not None:
+            self.salt_task.cancel()
+            await self.salt_task
+            self.salt_task = None
+
+        await self.stop_standby()
+
         await self.connection.close()
 
+        # The receive task may have died with an error (e.g.: Unauthorized), which is raised again once everything
+        # else has been torn down
+        error = None
+
         if self.recv_task:
-            await self.recv_task
+            result, = await asyncio.gather(self.recv_task, return_exceptions=True)
+            self.recv_task = None
+
+            if isinstance(result, Exception):
+                error = result
+
+        if self.acks_timer is not None:
+            self.acks_timer.cancel()
+            self.acks_timer = None
+
+        if self.send_task:
+            self.send_task.cancel()
+            await self.send_task
+            self.send_task = None
+
+        for task in [*self.decode_tasks, self.dispatch_task]:
+            if task is not None:
+                task.cancel()
+
+        await asyncio.gather(*self.decode_tasks, return_exceptions=True)
+        self.decode_tasks.clear()
+
+        if self.dispatch_task is not None:
+            await asyncio.gather(self.dispatch_task, return_exceptions=True)
+            self.dispatch_task = None
+
+        for queue in (self.decode_queue, self.dispatch_queue):
+            while not queue.empty():
+                queue.get_nowait()
+
+        # Updates that were already received are still delivered across restarts
+        if not restart and self.updates_task is not None:
+            self.updates_task.cancel()
+            await asyncio.gather(self.updates_task, return_exceptions=True)
+            self.updates_task = None
+
+        # Requests still waiting would only be answered after a restart, let them time out now instead
+        if not restart:
+            self.deadlines.clear()
 
         if not self.is_media and callable(self.client.disconnect_handler):
             try:
@@ -182,25 +361,187 @@ class Session:
 
         log.info("Session stopped")
 
+        if error is not None:
+            raise error
+
     async def restart(self):
-        await self.stop()
+        self.metrics.count("reconnects")
+
+        await self.stop(restart=True)
         await self.start()
 
-    async def handle_packet(self, packet):
+    def ensure_standby(self):
+        if not self.client.warm_standby or self.is_media or self.is_cdn:
+            return
+
+        if self.standby is None and (self.standby_task is None or self.standby_task.done()):
+            self.standby_task = self.loop.create_task(self.start_standby())
+
+    async def start_standby(self):
+        connection = self.create_connection()
+
         try:
-            data = await self.loop.run_in_executor(
-                pyrogram.crypto_executor,
-                mtproto.unpack,
-                BytesIO(packet),
-                self.session_id,
-                self.auth_key,
-                self.auth_key_id
-            )
-        except ValueError as e:
-            log.debug(e)
-            self.loop.create_task(self.restart())
+            await connection.connect()
+        except OSError:
+            await connection.close()
+            return
+
+        self.standby = connection
+        self.standby_recv_task = self.loop.create_task(self.recv_worker(connection))
+
+        await self.update_dc_options(connection)
+
+        # Bind the connection to this session, so that it's ready to carry requests right away
+        try:
+            await self.send_via(connection, await self.init_connection_query())
+        except OSError as e:
+            log.warning("Unable to initialize the standby connection: %s", e)
+            await connection.close()
             return
 
+        log.info("Standby connection ready")
+
+    async def stop_standby(self):
+        if self.standby_task is not None:
+            self.standby_task.cancel()
+            await asyncio.gather(self.standby_task, return_exceptions=True)
+            self.standby_task = None
+
+        if self.standby is not None:
+            await self.standby.close()
+
+        if self.standby_recv_task is not None:
+            await self.standby_recv_task
+
+        self.standby = None
+        self.standby_recv_task = None
+
+    def switch_to_standby(self):
+        connection = self.connection
+
+        self.connection = self.standby
+        self.recv_task = self.standby_recv_task
+
+        self.standby = None
+        self.standby_recv_task = None
+
+        log.info("Switched to the standby connection")
+        self.metrics.count("switchovers")
+
+        self.loop.create_task(connection.close())
+
+        self.resend_requests()
+        self.ensure_standby()
+
+    async def send_via(self, connection: Connection, data: TLObject):
+        """Send a message over a specific connection of this session, without waiting for the answer."""
+        message = self.msg_factory(data)
+
+        payload = await self.run_crypto(
+            message.length,
+            mtproto.pack,
+            message,
+            self.salt,
+            self.session_id,
+            self.auth_key,
+            self.auth_key_id
+        )
+
+        await connection.send(payload)
+        self.metrics.observe_sent(len(payload))
+
+    @property
+    def in_flight(self) -> int:
+        """Number of sent requests still waiting for a response."""
+        return len(self.results)
+
+    @property
+    def pending_packets(self) -> int:
+        """Number of received packets waiting to be decrypted or dispatched."""
+        return self.dispatch_queue.qsize()
+
+    @property
+    def pending_updates(self) -> int:
+        """Number of received updates waiting to be handled by the client.
+
+        Up to ``MAX_UPDATES_TASKS`` of them are being handled at once, the rest wait in the queue.
+        """
+        return self.updates_queue.qsize() + len(self.updates_tasks)
+
+    async def decode_worker(self):
+        while True:
+            packet, future = await self.decode_queue.get()
+
+            try:
+                data = await self.run_crypto(
+                    len(packet),
+                    mtproto.unpack,
+                    BytesIO(packet),
+                    self.session_id,
+                    self.auth_key,
+                    self.auth_key_id
+                )
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(data)
+
+    async def dispatch_worker(self):
+        while True:
+            future = await self.dispatch_queue.get()
+
+            try:
+                data = await future
+            except ValueError as e:
+                log.debug(e)
+                self.loop.create_task(self.restart())
+                continue
+            except Exception as e:
+                log.info("Discarding packet: %s", e)
+                continue
+
+            try:
+                await self.handle_packet(data)
+            except Exception as e:
+                log.exception(e)
+
+    async def updates_worker(self):
+        # Updates are handled concurrently, so that difference requests don't hold back the ones that follow, but
+        # each task only stores and dispatches its updates after the previous one did, keeping them in order.
+        # During bursts, the tasks are capped and the rest of the updates wait in the queue
+        previous = None
+
+        def done(task: asyncio.Task):
+            self.updates_tasks.discard(task)
+            self.updates_semaphore.release()
+
+        try:
+            while True:
+                # Wait for a free slot first, so that updates not being handled yet stay in the queue
+                await self.updates_semaphore.acquire()
+
+                try:
+                    updates = await self.updates_queue.get()
+                except asyncio.CancelledError:
+                    self.updates_semaphore.release()
+                    raise
+
+                previous = self.loop.create_task(self.handle_updates(updates, previous))
+                self.updates_tasks.add(previous)
+                previous.add_done_callback(done)
+        finally:
+            for task in self.updates_tasks:
+                task.cancel()
+
+            await asyncio.gather(*self.updates_tasks, return_exceptions=True)
+
+    async def handle_updates(self, updates, previous: Optional[asyncio.Task]):
+        try:
+            await self.client.handle_updates(updates, previous)
+        except Exception as e:
+            log.exception(e)
+
+    async def handle_packet(self, data: Message):
         messages = (
             data.body.messages
             if isinstance(data.body, MsgContainer)
@@ -217,11 +558,8 @@ class Session:
                     self.pending_acks.add(msg.msg_id)
 
             try:
-                if len(self.stored_msg_ids) > Session.STORED_MSG_IDS_MAX_SIZE:
-                    del self.stored_msg_ids[:Session.STORED_MSG_IDS_MAX_SIZE // 2]
-
                 if self.stored_msg_ids:
-                    if msg.msg_id < self.stored_msg_ids[0]:
+                    if msg.msg_id < self.stored_msg_ids.lowest:
                         raise SecurityCheckMismatch("The msg_id is lower than all the stored values")
 
                     if msg.msg_id in self.stored_msg_ids:
@@ -241,7 +579,7 @@ class Session:
                 await self.connection.close()
                 return
             else:
-                bisect.insort(self.stored_msg_ids, msg.msg_id)
+                self.stored_msg_ids.add(msg.msg_id)
 
             if isinstance(msg.body, (raw.types.MsgDetailedInfo, raw.types.MsgNewDetailedInfo)):
                 self.pending_acks.add(msg.body.answer_msg_id)
@@ -250,6 +588,13 @@ class Session:
             if isinstance(msg.body, raw.types.NewSessionCreated):
                 continue
 
+            if isinstance(msg.body, raw.types.MsgsAck):
+                for msg_id in msg.body.msg_ids:
+                    for msg_id in self.containers.get(msg_id, [msg_id]):
+                        if msg_id in self.requests:
+                            self.acked_requests.add(msg_id)
+                continue
+
             msg_id = None
 
             if isinstance(msg.body, (raw.types.BadMsgNotification, raw.types.BadServerSalt)):
@@ -258,23 +603,28 @@ class Session:
                 msg_id = msg.body.req_msg_id
             elif isinstance(msg.body, raw.types.Pong):
                 msg_id = msg.body.msg_id
+
+                if self.ping_id and msg.body.ping_id == self.ping_id:
+                    self.metrics.observe_rtt(self.loop.time() - self.ping_sent_at)
             else:
                 if self.client is not None:
-                    self.loop.create_task(self.client.handle_updates(msg.body))
+                    self.updates_queue.put_nowait(msg.body)
 
-            if msg_id in self.results:
-                self.results[msg_id].value = getattr(msg.body, "result", msg.body)
-                self.results[msg_id].event.set()
+            for msg_id in self.containers.pop(msg_id, [msg_id]):
+                future = self.results.get(msg_id)
 
-        if len(self.pending_acks) >= self.ACKS_THRESHOLD:
-            log.debug("Sending %s acks", len(self.pending_acks))
+                if future is not None and not future.done():
+                    future.set_result(getattr(msg.body, "result", msg.body))
 
-            try:
-                await self.send(raw.types.MsgsAck(msg_ids=list(self.pending_acks)), False)
-            except OSError:
-                pass
-            else:
-                self.pending_acks.clear()
+        if self.pending_acks and self.acks_timer is None:
+            self.acks_timer = self.loop.call_later(self.ACKS_FLUSH_DELAY, self.flush_acks)
+
+    def flush_acks(self):
+        self.acks_timer = None
+
+        # Wake up the send worker, it will send the pending acks even if there's nothing else to send
+        if self.pending_acks and self.send_task is not None:
+            self.outgoing_event.set()
 
     async def ping_worker(self):
         log.info("PingTask started")
@@ -287,31 +637,112 @@ class Session:
             else:
                 break
 
+            self.ping_id += 1
+            self.ping_sent_at = self.loop.time()
+
             try:
                 await self.send(
                     raw.functions.PingDelayDisconnect(
-                        ping_id=0, disconnect_delay=self.WAIT_TIMEOUT + 10
+                        ping_id=self.ping_id, disconnect_delay=self.WAIT_TIMEOUT + 10
                     ), False
                 )
             except OSError:
+                if self.standby is not None:
+                    self.switch_to_standby()
+                    continue
+
                 self.loop.create_task(self.restart())
                 break
             except RPCError:
                 pass
 
+            if self.standby is not None:
+                try:
+                    await self.send_via(
+                        self.standby,
+                        raw.functions.PingDelayDisconnect(
+                            ping_id=0, disconnect_delay=self.WAIT_TIMEOUT + 10
+                        )
+                    )
+                except OSError:
+                    pass
+
+            self.ensure_standby()
+
         log.info("PingTask stopped")
 
-    async def recv_worker(self):
+    async def load_dc_options(self):
+        if not self.client.dc_options.loaded:
+            self.client.dc_options.load(await self.client.storage.dc_options())
+
+    async def update_dc_options(self, connection: Connection, config: Optional[TLObject] = None):
+        """Remember how fast the addresses tried by a connection were, and the endpoints advertised by the config."""
+        if isinstance(config, raw.types.Config):
+            self.client.dc_options.update(config.dc_options)
+
+        for address, latency in connection.latencies.items():
+            self.client.dc_options.report(address, latency)
+
+        if self.client.dc_options.changed:
+            await self.client.storage.dc_options(self.client.dc_options.dump())
+            self.client.dc_options.changed = False
+
+    async def load_salts(self):
+        if not self.is_cdn and not self.server_salts:
+            self.server_salts.load(await self.client.storage.server_salts(self.dc_id))
+
+        salt = self.server_salts.current()
+
+        if salt is not None:
+            self.salt = salt
+
+    async def salt_worker(self):
+        log.info("SaltTask started")
+
+        while True:
+            try:
+                if self.server_salts.remaining() < self.SALTS_REFRESH_THRESHOLD:
+                    future_salts = await self.send(
+                        raw.functions.GetFutureSalts(num=self.SALTS_COUNT),
+                        bypass_window=True
+                    )
+
+                    self.server_salts.update(future_salts)
+
+                    if not self.is_cdn:
+                        await self.client.storage.server_salts(self.dc_id, self.server_salts.salts)
+
+                salt = self.server_salts.current()
+
+                if salt is not None and salt != self.salt:
+                    log.debug("Server salt rotated")
+                    self.salt = salt
+            except asyncio.CancelledError:
+                break
+            except (OSError, RPCError) as e:
+                log.warning("Unable to fetch future salts: %s", e)
+
+            try:
+                await asyncio.sleep(self.SALTS_CHECK_INTERVAL)
+            except asyncio.CancelledError:
+                break
+
+        log.info("SaltTask stopped")
+
+    async def recv_worker(self, connection: Connection):
         log.info("NetworkTask started")
 
         while True:
-            packet = await self.connection.recv()
+            packet = await connection.recv()
+
+            if packet is not None:
+                self.metrics.observe_received(len(packet))
 
             if packet is None or len(packet) == 4:
                 if packet:
                     error_code = -Int.read(BytesIO(packet))
 
-                    if error_code == 404:
+                    if error_code == 404 and connection is self.connection:
                         raise Unauthorized(
                             "Auth key not found in the system. You must delete your session file "
                             "and log in again with your phone number or bot token."
@@ -322,63 +753,327 @@ class Session:
                         error_code, Session.TRANSPORT_ERRORS.get(error_code, "unknown error")
                     )
 
-                if self.is_started.is_set():
-                    self.loop.create_task(self.restart())
+                if connection is not self.connection:
+                    # The standby connection dropped, a new one is started by the ping worker
+                    if connection is self.standby:
+                        self.standby = None
+                        self.standby_recv_task = None
+                elif self.is_started.is_set():
+                    if self.standby is not None:
+                        self.switch_to_standby()
+                    else:
+                        self.loop.create_task(self.restart())
 
                 break
 
-            self.loop.create_task(self.handle_packet(packet))
+            # Decoding happens concurrently, but packets are dispatched in the same order they were received
+            future = self.loop.create_future()
+
+            await self.dispatch_queue.put(future)
+            await self.decode_queue.put((packet, future))
 
         log.info("NetworkTask stopped")
 
-    async def send(self, data: TLObject, wait_response: bool = True, timeout: float = WAIT_TIMEOUT):
+    async def send_worker(self):
+        log.info("SendTask started")
+
+        batch: List[Tuple[Message, asyncio.Future]] = []
+
+        try:
+            while True:
+                await self.outgoing_event.wait()
+                await asyncio.sleep(self.SEND_BATCH_WINDOW)
+
+                batch = self.next_batch()
+
+                if not any(self.outgoing):
+                    self.outgoing_event.clear()
+
+                messages = [m for m, _ in batch]
+                acks = list(self.pending_acks)
+
+                if acks:
+                    log.debug("Sending %s acks", len(acks))
+
+                    self.pending_acks.clear()
+                    messages.append(self.msg_factory(raw.types.MsgsAck(msg_ids=acks)))
+
+                if not messages:
+                    continue
+
+                if len(messages) == 1:
+                    message = messages[0]
+                else:
+                    message = self.msg_factory(MsgContainer(messages))
+                    self.containers[message.msg_id] = [m.msg_id for m in messages]
+
+                    if len(self.containers) > self.STORED_MSG_IDS_MAX_SIZE:
+                        for _ in range(self.STORED_MSG_IDS_MAX_SIZE // 2):
+                            del self.containers[next(iter(self.containers))]
+
+                try:
+                    payload = await self.run_crypto(
+                        message.length,
+                        mtproto.pack,
+                        message,
+                        self.salt,
+                        self.session_id,
+                        self.auth_key,
+                        self.auth_key_id
+                    )
+
+                    await self.connection.send(payload)
+                    self.metrics.observe_sent(len(payload))
+                except Exception as e:
+                    self.pending_acks.update(acks)
+
+                    for _, future in batch:
+                        if future is not None and not future.done():
+                            future.set_exception(e)
+                else:
+                    for _, future in batch:
+                        if future is not None and not future.done():
+                            future.set_result(None)
+
+                batch = []
+        except asyncio.CancelledError:
+            pass
+        finally:
+            # Whatever is left unsent will never reach the server on this connection
+            for _, future in [*batch, *(item for queue in self.outgoing for item in queue)]:
+                if future is not None and not future.done():
+                    future.set_exception(ConnectionError("Session stopped"))
+
+            for queue in self.outgoing:
+                queue.clear()
+
+            self.outgoing_event.clear()
+
+        log.info("SendTask stopped")
+
+    def next_batch(self) -> List[Tuple[Message, asyncio.Future]]:
+        batch = []
+        length = 0
+
+        for queue in self.outgoing:
+            while queue and len(batch) < self.MAX_CONTAINER_MESSAGES:
+                message, future = queue[0]
+
+                if future is not None and future.done():
+                    queue.popleft()
+                    continue
+
+                # 16 = msg_id (8) + seq_no (4) + length (4)
+                length += message.length + 16
+
+                if batch and length > self.MAX_CONTAINER_LENGTH:
+                    return batch
+
+                batch.append(queue.popleft())
+
+        return batch
+
+    async def run_crypto(self, size: int, func: Callable, *args: Any) -> Any:
+        started = time.perf_counter()
+
+        try:
+            if size < self.CRYPTO_INLINE_THRESHOLD:
+                self.inline_crypto_count += 1
+                return self.crypto_worker.run(func, *args)
+
+            self.offloaded_crypto_count += 1
+            return await self.loop.run_in_executor(self.crypto_worker, func, *args)
+        finally:
+            self.metrics.crypto_time += time.perf_counter() - started
+
+    def resend_requests(self):
+        """Send again the requests left without an answer by a previous connection, keeping their msg_id."""
+        if not self.requests:
+            return
+
+        now = MsgId() >> 32
+        unacked, acked = [], []
+
+        for msg_id, message in self.requests.items():
+            if now - (msg_id >> 32) > self.RESEND_MAX_AGE:
+                continue
+
+            # The server already has these, only their answers went lost
+            if msg_id in self.acked_requests:
+                acked.append(msg_id)
+            else:
+                unacked.append(message)
+
+        if not unacked and not acked:
+            return
+
+        log.info("Resending %s requests, asking again for %s answers", len(unacked), len(acked))
+
+        if acked:
+            unacked.append(self.msg_factory(raw.types.MsgResendAnsReq(msg_ids=acked)))
+
+        # Requests that were already waiting go before anything else
+        self.outgoing[enums.RequestPriority.INTERACTIVE.value].extend((message, None) for message in unacked)
+        self.outgoing_event.set()
+
+    async def send_message(self, message: Message, priority: int = enums.RequestPriority.NORMAL.value):
+        if self.send_task is None:
+            raise ConnectionError("Session is not connected")
+
+        future = self.loop.create_future()
+
+        self.outgoing[priority].append((message, future))
+        self.outgoing_event.set()
+
+        await future
+
+    @property
+    def hedge_delay(self) -> Optional[float]:
+        """Time to wait for an answer before hedging a request, None until enough latencies are known."""
+        if len(self.hedge_latencies) < self.HEDGE_MIN_SAMPLES:
+            return None
+
+        latencies = sorted(self.hedge_latencies)
+        index = min(len(latencies) - 1, len(latencies) * self.HEDGE_PERCENTILE // 100)
+
+        return max(self.HEDGE_MIN_DELAY, latencies[index])
+
+    async def hedge(
+        self,
+        data: TLObject,
+        msg_id: int,
+        future: asyncio.Future,
+        timeout: float,
+        priority: "enums.RequestPriority"
+    ):
+        delay = self.hedge_delay
+
+        if delay is None or delay >= timeout:
+            return await future
+
+        done, _ = await asyncio.wait([future], timeout=delay)
+
+        if done:
+            return future.result()
+
         message = self.msg_factory(data)
-        msg_id = message.msg_id
+        hedge_future = self.results[message.msg_id] = self.loop.create_future()
+        self.deadlines.add(hedge_future, timeout - delay)
 
-        if wait_response:
-            self.results[msg_id] = Result()
+        log.debug("Hedged: %s", message)
 
-        log.debug("Sent: %s", message)
+        try:
+            await self.send_message(message, priority.value)
+        except OSError:
+            self.results.pop(message.msg_id, None)
+            return await future
 
-        payload = await self.loop.run_in_executor(
-            pyrogram.crypto_executor,
-            mtproto.pack,
-            message,
-            self.salt,
-            self.session_id,
-            self.auth_key,
-            self.auth_key_id
-        )
+        pending = {future: msg_id, hedge_future: message.msg_id}
+        result = None
 
         try:
-            await self.connection.send(payload)
-        except OSError as e:
-            self.results.pop(msg_id, None)
-            raise e
+            while pending and result is None:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                for f in done:
+                    pending.pop(f)
+                    result = f.result() if result is None else result
+        finally:
+            self.results.pop(message.msg_id, None)
+
+            # The loser's answer is no longer needed, ask the server not to send it
+            for loser_msg_id in pending.values():
+                self.results.pop(loser_msg_id, None)
+                self.loop.create_task(self.drop_answer(loser_msg_id))
+
+        return result
+
+    async def drop_answer(self, msg_id: int):
+        try:
+            await self.send(raw.functions.RpcDropAnswer(req_msg_id=msg_id), False)
+        except OSError:
+            pass
+
+    async def send(
+        self,
+        data: TLObject,
+        wait_response: bool = True,
+        timeout: float = WAIT_TIMEOUT,
+        hedge: bool = False,
+        priority: "enums.RequestPriority" = enums.RequestPriority.NORMAL,
+        bypass_window: bool = False
+    ):
+        # Service requests of the session itself (pings, connection init, salts) never wait for a slot, they must get
+        # through even when the window is full of requests stuck on a dead connection
+        acquire = wait_response and not bypass_window
+
+        # Wait for a free slot in the in-flight window before the msg_id is generated, so it doesn't get stale
+        if acquire:
+            await self.window.acquire(priority.value)
+
+        try:
+            message = self.msg_factory(data)
+            msg_id = message.msg_id
+
+            if wait_response:
+                future = self.results[msg_id] = self.loop.create_future()
+                self.deadlines.add(future, timeout)
+                self.requests[msg_id] = message
+
+            log.debug("Sent: %s", message)
 
-        if wait_response:
             try:
-                await asyncio.wait_for(self.results[msg_id].event.wait(), timeout)
-            except asyncio.TimeoutError:
-                pass
+                await self.send_message(message, priority.value)
+            except OSError as e:
+                self.results.pop(msg_id, None)
+                self.requests.pop(msg_id, None)
+                raise e
 
-            result = self.results.pop(msg_id).value
+            if wait_response:
+                sent_at = self.loop.time()
+
+                try:
+                    if hedge:
+                        result = await self.hedge(data, msg_id, future, timeout, priority)
+                    else:
+                        result = await future
+                finally:
+                    self.results.pop(msg_id, None)
+                    self.requests.pop(msg_id, None)
+                    self.acked_requests.discard(msg_id)
+        finally:
+            if acquire:
+                self.window.release()
+
+        if wait_response:
+            query = utils.unwrap_query(data)
+            query_name = ".".join(query.QUALNAME.split(".")[1:])
 
             if result is None:
+                self.metrics.count("timeouts", query_name)
                 raise TimeoutError("Request timed out")
 
-            if isinstance(result, raw.types.RpcError):
-                if isinstance(data, (raw.functions.InvokeWithoutUpdates, raw.functions.InvokeWithTakeout)):
-                    data = data.query
+            latency = self.loop.time() - sent_at
+
+            self.metrics.observe_request(query_name, latency)
 
-                RPCError.raise_it(result, type(data))
+            if isinstance(query, self.HEDGE_FUNCTIONS):
+                self.hedge_latencies.append(latency)
+
+            if isinstance(result, raw.types.RpcError):
+                self.metrics.count("errors", query_name)
+                RPCError.raise_it(result, type(query))
 
             if isinstance(result, raw.types.BadMsgNotification):
                 log.warning("%s: %s", BadMsgNotification.__name__, BadMsgNotification(result.error_code))
 
             if isinstance(result, raw.types.BadServerSalt):
                 self.salt = result.new_server_salt
-                return await self.send(data, wait_response, timeout)
+
+                # The known salts are stale, let the salt worker fetch fresh ones
+                self.server_salts.load([])
+
+                return await self.send(data, wait_response, timeout, hedge, priority, bypass_window)
 
             return result
 
@@ -387,26 +1082,34 @@ class Session:
         query: TLObject,
         retries: int = MAX_RETRIES,
         timeout: float = WAIT_TIMEOUT,
-        sleep_threshold: float = SLEEP_THRESHOLD
+        sleep_threshold: float = SLEEP_THRESHOLD,
+        priority: "enums.RequestPriority" = enums.RequestPriority.NORMAL
     ):
         try:
             await asyncio.wait_for(self.is_started.wait(), self.WAIT_TIMEOUT)
         except asyncio.TimeoutError:
             pass
 
-        if isinstance(query, (raw.functions.InvokeWithoutUpdates, raw.functions.InvokeWithTakeout)):
-            inner_query = query.query
-        else:
-            inner_query = query
-
+        inner_query = utils.unwrap_query(query)
         query_name = ".".join(inner_query.QUALNAME.split(".")[1:])
+        hedge = self.client.hedge_requests and isinstance(inner_query, self.HEDGE_FUNCTIONS)
+        peer_id = utils.get_query_peer_id(inner_query)
 
         while True:
+            # Wait along with the other callers if this function (for this peer) is already flood waited
+            await self.client.flood_gate.wait(query_name, peer_id, sleep_threshold)
+
             try:
-                return await self.send(query, timeout=timeout)
+                return await self.send(query, timeout=timeout, hedge=hedge, priority=priority)
             except (FloodWait, FloodPremiumWait) as e:
                 amount = e.value
 
+                self.metrics.observe_flood_wait(query_name, amount)
+                self.client.flood_gate.close(query_name, peer_id, amount)
+
+                if self.client.rate_limiter is not None:
+                    self.client.rate_limiter.flood_wait(inner_query, amount)
+
                 if amount > sleep_threshold >= 0:
                     raise
 
@@ -418,6 +1121,8 @@ class Session:
                 if retries == 0:
                     raise e from None
 
+                self.metrics.count("retries", query_name)
+
                 (log.warning if retries < 2 else log.info)(
                     '[%s] Retrying "%s" due to: %s',
                     Session.MAX_RETRIES - retries + 1,
@@ -426,4 +1131,4 @@ class Session:
 
                 await asyncio.sleep(0.5)
 
-                return await self.invoke(query, retries - 1, timeout)
+                return await self.invoke(query, retries - 1, timeout, priority=priority)
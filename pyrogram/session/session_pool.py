@@ -0,0 +1,63 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+from typing import List, Any
+
+from pyrogram.raw.core import TLObject
+from .metrics import Metrics
+from .session import Session
+
+
+class SessionPool:
+    """A group of sessions connected to the same DC and sharing the same auth key.
+
+    Each request is routed to the session with the fewest requests in flight, so that small requests don't queue
+    behind big file parts on a single connection.
+    """
+
+    def __init__(self, sessions: List[Session]):
+        self.sessions = sessions
+        self.in_flight = {session: 0 for session in sessions}
+
+    @property
+    def dc_id(self) -> int:
+        return self.sessions[0].dc_id
+
+    @property
+    def metrics(self) -> Metrics:
+        return Metrics.merge(session.metrics for session in self.sessions)
+
+    def least_busy(self) -> Session:
+        return min(self.sessions, key=self.in_flight.__getitem__)
+
+    async def start(self):
+        await asyncio.gather(*(session.start() for session in self.sessions))
+
+    async def stop(self):
+        for session in self.sessions:
+            await session.stop()
+
+    async def invoke(self, query: TLObject, *args: Any, **kwargs: Any) -> Any:
+        session = self.least_busy()
+        self.in_flight[session] += 1
+
+        try:
+            return await session.invoke(query, *args, **kwargs)
+        finally:
+            self.in_flight[session] -= 1
@@ -47,6 +47,38 @@ CREATE TABLE update_state
 );
 """
 
+DC_AUTH_KEYS_SCHEMA = """
+CREATE TABLE dc_auth_keys
+(
+    dc_id    INTEGER PRIMARY KEY,
+    auth_key BLOB
+);
+"""
+
+SERVER_SALTS_SCHEMA = """
+CREATE TABLE server_salts
+(
+    dc_id       INTEGER,
+    valid_since INTEGER,
+    valid_until INTEGER,
+    salt        INTEGER
+);
+
+CREATE INDEX idx_server_salts_dc_id ON server_salts (dc_id);
+"""
+
+DC_OPTIONS_SCHEMA = """
+CREATE TABLE dc_options
+(
+    dc_id      INTEGER,
+    ip_address TEXT,
+    port       INTEGER,
+    is_ipv6    INTEGER,
+    is_media   INTEGER,
+    latency    REAL
+);
+"""
+
 
 class FileStorage(SQLiteStorage):
     FILE_EXTENSION = ".session"
@@ -89,6 +121,24 @@ class FileStorage(SQLiteStorage):
 
             version += 1
 
+        if version == 6:
+            with self.conn:
+                self.conn.executescript(DC_AUTH_KEYS_SCHEMA)
+
+            version += 1
+
+        if version == 7:
+            with self.conn:
+                self.conn.executescript(SERVER_SALTS_SCHEMA)
+
+            version += 1
+
+        if version == 8:
+            with self.conn:
+                self.conn.executescript(DC_OPTIONS_SCHEMA)
+
+            version += 1
+
         self.version(version)
 
     async def open(self):
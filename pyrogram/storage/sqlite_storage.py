@@ -19,7 +19,7 @@
 import inspect
 import sqlite3
 import time
-from typing import List, Tuple, Any
+from typing import List, Tuple, Any, Optional
 
 from pyrogram import raw
 from .storage import Storage
@@ -68,6 +68,32 @@ CREATE TABLE version
     number INTEGER PRIMARY KEY
 );
 
+CREATE TABLE dc_auth_keys
+(
+    dc_id    INTEGER PRIMARY KEY,
+    auth_key BLOB
+);
+
+CREATE TABLE server_salts
+(
+    dc_id       INTEGER,
+    valid_since INTEGER,
+    valid_until INTEGER,
+    salt        INTEGER
+);
+
+CREATE INDEX idx_server_salts_dc_id ON server_salts (dc_id);
+
+CREATE TABLE dc_options
+(
+    dc_id      INTEGER,
+    ip_address TEXT,
+    port       INTEGER,
+    is_ipv6    INTEGER,
+    is_media   INTEGER,
+    latency    REAL
+);
+
 CREATE INDEX idx_peers_id ON peers (id);
 CREATE INDEX idx_peers_phone_number ON peers (phone_number);
 CREATE INDEX idx_usernames_id ON usernames (id);
@@ -106,7 +132,7 @@ def get_input_peer(peer_id: int, access_hash: int, peer_type: str):
 
 
 class SQLiteStorage(Storage):
-    VERSION = 6
+    VERSION = 9
     USERNAME_TTL = 8 * 60 * 60
 
     def __init__(self, name: str):
@@ -256,6 +282,62 @@ class SQLiteStorage(Storage):
     async def is_bot(self, value: bool = object):
         return self._accessor(value)
 
+    async def dc_auth_key(self, dc_id: int, value: bytes = object):
+        if value == object:
+            r = self.conn.execute(
+                "SELECT auth_key FROM dc_auth_keys WHERE dc_id = ?",
+                (dc_id,)
+            ).fetchone()
+
+            return r[0] if r else None
+
+        with self.conn:
+            if value is None:
+                self.conn.execute(
+                    "DELETE FROM dc_auth_keys WHERE dc_id = ?",
+                    (dc_id,)
+                )
+            else:
+                self.conn.execute(
+                    "REPLACE INTO dc_auth_keys (dc_id, auth_key) VALUES (?, ?)",
+                    (dc_id, value)
+                )
+
+    async def server_salts(self, dc_id: int, value: List[Tuple[int, int, int]] = object):
+        if value == object:
+            return self.conn.execute(
+                "SELECT valid_since, valid_until, salt FROM server_salts WHERE dc_id = ?",
+                (dc_id,)
+            ).fetchall()
+
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM server_salts WHERE dc_id = ?",
+                (dc_id,)
+            )
+
+            self.conn.executemany(
+                "INSERT INTO server_salts (dc_id, valid_since, valid_until, salt) VALUES (?, ?, ?, ?)",
+                [(dc_id, *salt) for salt in value]
+            )
+
+    async def dc_options(self, value: List[Tuple[int, str, int, bool, bool, Optional[float]]] = object):
+        if value == object:
+            return [
+                (dc_id, ip_address, port, bool(is_ipv6), bool(is_media), latency)
+                for dc_id, ip_address, port, is_ipv6, is_media, latency in self.conn.execute(
+                    "SELECT dc_id, ip_address, port, is_ipv6, is_media, latency FROM dc_options"
+                )
+            ]
+
+        with self.conn:
+            self.conn.execute("DELETE FROM dc_options")
+
+            self.conn.executemany(
+                "INSERT INTO dc_options (dc_id, ip_address, port, is_ipv6, is_media, latency) VALUES (?, ?, ?, ?, ?, ?)",
+                value
+            )
+
     def version(self, value: int = object):
         if value == object:
             return self.conn.execute(
@@ -19,7 +19,7 @@
 from abc import ABC, abstractmethod
 import base64
 import struct
-from typing import List, Tuple
+from typing import List, Tuple, Optional
 
 
 class Storage(ABC):
@@ -208,6 +208,57 @@ class Storage(ABC):
         """
         raise NotImplementedError
 
+    async def dc_auth_key(self, dc_id: int, value: Optional[bytes] = object):
+        """Get or set the authorization key for a data center other than the session's one.
+
+        Keys stored here are reused across restarts for media, CDN and business sessions, so that they don't need to
+        be created and authorized again. Storage engines that don't override this method simply don't persist them.
+
+        Parameters:
+            dc_id (``int``):
+                The data center the key belongs to.
+
+            value (``bytes``, *optional*):
+                The authorization key to set. Pass None to delete the stored key.
+        """
+        return None
+
+    async def server_salts(self, dc_id: int, value: List[Tuple[int, int, int]] = object):
+        """Get or set the future server salts known for a data center.
+
+        Storage engines that don't override this method simply don't persist them, in which case sessions learn the
+        salt from the server after starting.
+
+        Parameters:
+            dc_id (``int``):
+                The data center the salts belong to.
+
+            value (``List[Tuple[int, int, int]]``, *optional*):
+                The salts to set, replacing the stored ones. Each tuple must contain the following information:
+                - ``int``: The date since which the salt is valid.
+                - ``int``: The date until which the salt is valid.
+                - ``int``: The salt.
+        """
+        return []
+
+    async def dc_options(self, value: List[Tuple[int, str, int, bool, bool, Optional[float]]] = object):
+        """Get or set the data center endpoints learnt from the server config.
+
+        Storage engines that don't override this method simply don't persist them, in which case sessions connect to
+        the built-in addresses until the config is received again.
+
+        Parameters:
+            value (``List[Tuple[int, str, int, bool, bool, Optional[float]]]``, *optional*):
+                The endpoints to set, replacing the stored ones. Each tuple must contain the following information:
+                - ``int``: The data center id.
+                - ``str``: The IP address.
+                - ``int``: The port.
+                - ``bool``: True if it's an IPv6 address.
+                - ``bool``: True if it's meant for media only.
+                - ``float``: The latest connect latency in seconds, or None if it hasn't been measured yet.
+        """
+        return []
+
     async def export_session_string(self):
         """Exports the session string for the current session.
 
@@ -322,6 +322,42 @@ def get_peer_id(peer: Union[raw.base.Peer, raw.base.InputPeer, raw.base.Requeste
     raise ValueError(f"Peer type invalid: {peer}")
 
 
+# Functions that only wrap another one, passed in their "query" field
+QUERY_WRAPPERS = (
+    raw.functions.InvokeAfterMsg,
+    raw.functions.InvokeAfterMsgs,
+    raw.functions.InitConnection,
+    raw.functions.InvokeWithLayer,
+    raw.functions.InvokeWithoutUpdates,
+    raw.functions.InvokeWithMessagesRange,
+    raw.functions.InvokeWithTakeout,
+    raw.functions.InvokeWithBusinessConnection,
+    raw.functions.InvokeWithGooglePlayIntegrity,
+    raw.functions.InvokeWithApnsSecret
+)
+
+
+def unwrap_query(query: "raw.core.TLObject") -> "raw.core.TLObject":
+    """Get the function wrapped by any number of invoke wrappers (e.g.: InvokeWithTakeout, InvokeWithoutUpdates)"""
+    while isinstance(query, QUERY_WRAPPERS):
+        query = query.query
+
+    return query
+
+
+def get_query_peer_id(query: "raw.core.TLObject") -> Optional[int]:
+    """Get the non-raw id of the peer a raw function is acting on, if any"""
+    peer = getattr(query, "peer", None)
+
+    if peer is None:
+        return None
+
+    try:
+        return get_peer_id(peer)
+    except ValueError:
+        return None
+
+
 def get_peer_type(peer_id: int) -> str:
     if peer_id < 0:
         if MIN_CHAT_ID <= peer_id:
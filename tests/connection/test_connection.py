@@ -0,0 +1,99 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+
+import pytest
+
+from pyrogram.connection import Connection
+
+
+class FakeTCP:
+    """Transport whose connect takes a given time per address, and fails for negative ones."""
+
+    delays = {}
+    closed = []
+
+    def __init__(self, ipv6, proxy):
+        self.address = None
+
+    async def connect(self, address):
+        self.address = address
+        delay = self.delays[address]
+
+        await asyncio.sleep(abs(delay))
+
+        if delay < 0:
+            raise ConnectionRefusedError(address)
+
+    async def close(self):
+        self.closed.append(self.address)
+
+
+def make_connection(delays):
+    FakeTCP.delays = delays
+    FakeTCP.closed = []
+
+    return Connection(2, False, False, None, protocol_factory=FakeTCP, addresses=list(delays))
+
+
+@pytest.mark.asyncio
+async def test_slow_address_is_overtaken():
+    connection = make_connection({("10.0.0.1", 443): 5, ("10.0.0.2", 443): 0.01})
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    await connection.connect()
+
+    assert connection.address == ("10.0.0.2", 443)
+    assert connection.CONNECTION_ATTEMPT_DELAY <= loop.time() - started < 1
+    assert FakeTCP.closed == [("10.0.0.1", 443)]
+    assert list(connection.latencies) == [("10.0.0.2", 443)]
+
+
+@pytest.mark.asyncio
+async def test_failure_starts_next_attempt_right_away():
+    connection = make_connection({("10.0.0.1", 443): -0.01, ("10.0.0.2", 443): 0.01, ("10.0.0.3", 443): 0.01})
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    await connection.connect()
+
+    assert connection.address == ("10.0.0.2", 443)
+    assert loop.time() - started < connection.CONNECTION_ATTEMPT_DELAY
+    assert connection.latencies[("10.0.0.1", 443)] is None
+
+
+@pytest.mark.asyncio
+async def test_fast_first_address_wins():
+    connection = make_connection({("10.0.0.1", 443): 0, ("10.0.0.2", 443): 0})
+
+    await connection.connect()
+
+    assert connection.address == ("10.0.0.1", 443)
+    assert list(connection.latencies) == [("10.0.0.1", 443)]
+
+
+@pytest.mark.asyncio
+async def test_all_failed():
+    connection = make_connection({("10.0.0.1", 443): -0.01, ("10.0.0.2", 443): -0.3})
+
+    with pytest.raises(ConnectionRefusedError):
+        await connection.race()
+
+    assert connection.latencies == {("10.0.0.1", 443): None, ("10.0.0.2", 443): None}
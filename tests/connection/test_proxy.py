@@ -0,0 +1,185 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import ipaddress
+import os
+from base64 import b64encode
+from struct import unpack
+
+import pytest
+
+from pyrogram.connection.transport import ProxyError, TCPFull
+
+
+class ProxyStandIn:
+    """Minimal SOCKS4, SOCKS5 and HTTP CONNECT proxy that acts as the destination itself by echoing data back."""
+
+    def __init__(self, scheme: str, username: str = None, password: str = None):
+        self.scheme = scheme
+        self.username = username
+        self.password = password
+        self.destinations = []
+
+    async def socks4(self, reader, writer):
+        _, _, port = unpack(">BBH", await reader.readexactly(4))
+        address = ipaddress.IPv4Address(await reader.readexactly(4))
+        username = (await reader.readuntil(b"\x00"))[:-1].decode()
+        host = str(address)
+
+        if address.packed[:3] == b"\x00\x00\x00":
+            host = (await reader.readuntil(b"\x00"))[:-1].decode()
+
+        if self.username is not None and username != self.username:
+            writer.write(b"\x00\x5d" + bytes(6))
+            return None
+
+        writer.write(b"\x00\x5a" + bytes(6))
+        return host, port
+
+    async def socks5(self, reader, writer):
+        _, count = await reader.readexactly(2)
+        methods = await reader.readexactly(count)
+
+        if self.username is not None:
+            assert 2 in methods
+            writer.write(b"\x05\x02")
+
+            _, length = await reader.readexactly(2)
+            username = (await reader.readexactly(length)).decode()
+            password = (await reader.readexactly((await reader.readexactly(1))[0])).decode()
+
+            if (username, password) != (self.username, self.password):
+                writer.write(b"\x01\x01")
+                return None
+
+            writer.write(b"\x01\x00")
+        else:
+            writer.write(b"\x05\x00")
+
+        _, _, _, address_type = await reader.readexactly(4)
+
+        if address_type == 1:
+            host = str(ipaddress.IPv4Address(await reader.readexactly(4)))
+        elif address_type == 4:
+            host = str(ipaddress.IPv6Address(await reader.readexactly(16)))
+        else:
+            host = (await reader.readexactly((await reader.readexactly(1))[0])).decode()
+
+        port, = unpack(">H", await reader.readexactly(2))
+
+        writer.write(b"\x05\x00\x00\x04" + bytes(16) + bytes(2))
+        return host, port
+
+    async def http(self, reader, writer):
+        request = (await reader.readuntil(b"\r\n\r\n")).decode()
+        authority = request.split(" ")[1]
+
+        if self.username is not None:
+            credentials = b64encode(f"{self.username}:{self.password}".encode()).decode()
+
+            if f"Proxy-Authorization: Basic {credentials}\r\n" not in request:
+                writer.write(b"HTTP/1.1 407 Proxy Authentication Required\r\n\r\n")
+                return None
+
+        writer.write(b"HTTP/1.1 200 Connection established\r\nProxy-Agent: stand-in\r\n\r\n")
+
+        host, port = authority.rsplit(":", 1)
+        return host.strip("[]"), int(port)
+
+    async def handle(self, reader, writer):
+        destination = await getattr(self, self.scheme.lower())(reader, writer)
+
+        if destination is not None:
+            self.destinations.append(destination)
+
+            while data := await reader.read(65536):
+                writer.write(data)
+
+        writer.close()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("scheme,destination,credentials", [
+    ("socks4", ("149.154.167.51", 443), None),
+    ("socks4", ("example.org", 443), ("user", None)),
+    ("socks5", ("149.154.167.51", 443), None),
+    ("socks5", ("2001:67c:4e8:f002::a", 443), None),
+    ("socks5", ("example.org", 80), ("user", "pass")),
+    ("http", ("149.154.167.51", 443), None),
+    ("http", ("2001:67c:4e8:f002::a", 443), ("user", "pass")),
+])
+async def test_tunnel(scheme, destination, credentials):
+    username, password = credentials or (None, None)
+    proxy = ProxyStandIn(scheme, username, password)
+    port = await proxy.start()
+
+    protocol = TCPFull(ipv6=False, proxy=dict(
+        scheme=scheme,
+        hostname="127.0.0.1",
+        port=port,
+        username=username,
+        password=password
+    ))
+    await protocol.connect(destination)
+
+    payload = os.urandom(64)
+    await protocol.send(payload)
+
+    assert await protocol.recv() == payload
+    assert proxy.destinations == [destination]
+
+    await protocol.close()
+    await proxy.stop()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("scheme", ["socks4", "socks5", "http"])
+async def test_rejected(scheme):
+    proxy = ProxyStandIn(scheme, "user", "pass")
+    port = await proxy.start()
+
+    protocol = TCPFull(ipv6=False, proxy=dict(
+        scheme=scheme,
+        hostname="127.0.0.1",
+        port=port,
+        username="other",
+        password="wrong"
+    ))
+
+    with pytest.raises(ProxyError):
+        await protocol.connect(("149.154.167.51", 443))
+
+    await protocol.close()
+    await proxy.stop()
+
+
+@pytest.mark.asyncio
+async def test_unknown_scheme():
+    protocol = TCPFull(ipv6=False, proxy=dict(scheme="ftp", hostname="127.0.0.1", port=1))
+
+    with pytest.raises(ValueError):
+        await protocol.connect(("149.154.167.51", 443))
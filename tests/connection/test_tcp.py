@@ -0,0 +1,93 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import os
+from binascii import crc32
+from struct import pack
+
+import pytest
+
+from pyrogram.connection.transport import TCP, TCPFull, TCPIntermediate
+
+
+async def serve(size: int):
+    received = asyncio.get_running_loop().create_future()
+
+    async def handle(reader, writer):
+        received.set_result(await reader.readexactly(size))
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1], received
+
+
+@pytest.mark.asyncio
+async def test_sends_are_coalesced():
+    payloads = [os.urandom(4 * i) for i in range(1, 21)]
+    server, port, received = await serve(4 + sum(4 + len(p) for p in payloads))
+
+    protocol = TCPIntermediate(ipv6=False, proxy=None)
+    await protocol.connect(("127.0.0.1", port))
+
+    calls = []
+    writelines = protocol.transport.writelines
+    protocol.transport.writelines = lambda segments: calls.append(len(segments)) or writelines(segments)
+
+    await asyncio.gather(*[protocol.send(p) for p in payloads])
+    await asyncio.sleep(0)
+
+    # The handshake goes out first, then every frame in one call with its length prefix as a separate segment
+    assert calls == [1, 2 * len(payloads)]
+    assert await received == b"\xee" * 4 + b"".join(pack("<i", len(p)) + p for p in payloads)
+
+    await protocol.close()
+    server.close()
+    await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_drain_above_high_water(monkeypatch):
+    monkeypatch.setattr(TCP, "WRITE_BUFFER_HIGH_WATER", 1024)
+
+    payloads = [os.urandom(4096) for _ in range(4)]
+    server, port, received = await serve(sum(12 + len(p) for p in payloads))
+
+    protocol = TCPFull(ipv6=False, proxy=None)
+    await protocol.connect(("127.0.0.1", port))
+
+    drains = []
+    drain = protocol.drain
+    protocol.drain = lambda: drains.append(None) or drain()
+
+    for p in payloads:
+        await protocol.send(p)
+
+    assert len(drains) == len(payloads)
+
+    expected = b""
+
+    for seq_no, p in enumerate(payloads):
+        frame = pack("<II", len(p) + 12, seq_no) + p
+        expected += frame + pack("<I", crc32(frame))
+
+    assert await received == expected
+
+    await protocol.close()
+    server.close()
+    await server.wait_closed()
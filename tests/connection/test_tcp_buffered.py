@@ -0,0 +1,111 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import os
+from struct import pack
+
+import pytest
+
+from pyrogram.connection.transport import TCPAbridgedBuffered, TCPIntermediateBuffered, TCPBuffered
+from pyrogram.connection.transport.tcp.tcp_buffered import FrameProtocol
+
+
+def abridged(data: bytes) -> bytes:
+    length = len(data) // 4
+    return (bytes([length]) if length <= 126 else b"\x7f" + length.to_bytes(3, "little")) + data
+
+
+def intermediate(data: bytes) -> bytes:
+    return pack("<i", len(data)) + data
+
+
+async def serve(stream: bytes, chunk_size: int):
+    received = asyncio.get_running_loop().create_future()
+
+    async def handle(reader, writer):
+        received.set_result(await reader.readexactly(5))
+
+        for i in range(0, len(stream), chunk_size):
+            writer.write(stream[i:i + chunk_size])
+            await writer.drain()
+
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1], received
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+@pytest.mark.parametrize("factory,frame,handshake", [
+    (TCPAbridgedBuffered, abridged, b"\xef"),
+    (TCPIntermediateBuffered, intermediate, b"\xee" * 4),
+])
+async def test_frames(monkeypatch, chunk_size, factory, frame, handshake):
+    # Small buffers, so that frames span and outgrow them
+    monkeypatch.setattr(TCPBuffered, "BUFFER_SIZE", 1024)
+    monkeypatch.setattr(FrameProtocol, "MIN_READ_SIZE", 64)
+
+    payloads = [os.urandom(16), os.urandom(4 * 200), os.urandom(16 * 1024), os.urandom(4)] * 2
+    server, port, received = await serve(b"".join(frame(p) for p in payloads), chunk_size)
+
+    protocol = factory(ipv6=False, proxy=None)
+    await protocol.connect(("127.0.0.1", port))
+    await protocol.send(b"\x00" * 4)
+
+    frames = [await protocol.recv() for _ in payloads]
+
+    assert all(isinstance(f, memoryview) for f in frames)
+    assert [bytes(f) for f in frames] == payloads
+    assert await received == handshake + frame(b"\x00" * 4)[:5 - len(handshake)]
+    assert await protocol.recv() is None
+
+    await protocol.close()
+    server.close()
+    await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_pause_reading(monkeypatch):
+    # Small buffers, so that each read only picks up a few frames
+    monkeypatch.setattr(TCPBuffered, "BUFFER_SIZE", 1024)
+    monkeypatch.setattr(FrameProtocol, "MIN_READ_SIZE", 64)
+    monkeypatch.setattr(FrameProtocol, "MAX_PENDING_FRAMES", 4)
+
+    payloads = [os.urandom(256) for _ in range(64)]
+    server, port, received = await serve(b"".join(intermediate(p) for p in payloads), 1 << 16)
+
+    protocol = TCPIntermediateBuffered(ipv6=False, proxy=None)
+    await protocol.connect(("127.0.0.1", port))
+    await protocol.send(b"\x00" * 4)
+    await received
+    await asyncio.sleep(0.1)
+
+    # Nothing has been received yet: the protocol stopped reading once the limit was crossed
+    assert protocol.protocol.reading_paused
+    assert len(protocol.protocol.frames) < len(payloads)
+
+    frames = [bytes(await protocol.recv()) for _ in payloads]
+
+    assert frames == payloads
+    assert not protocol.protocol.reading_paused
+
+    await protocol.close()
+    server.close()
+    await server.wait_closed()
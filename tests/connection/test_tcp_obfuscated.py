@@ -0,0 +1,145 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+from pyrogram.connection import Connection
+from pyrogram.connection.transport import TCPAbridgedO, TCPIntermediateO
+from pyrogram.crypto import aes
+from pyrogram.crypto.executor import CryptoExecutor
+
+
+async def serve(tag: bytes):
+    """Obfuscated echo server: decrypts the client stream and sends it back encrypted with the server keystream."""
+    received = asyncio.get_running_loop().create_future()
+
+    async def handle(reader, writer):
+        nonce = await reader.readexactly(64)
+        temp = nonce[55:7:-1]
+
+        decryptor = aes.CTR256(nonce[8:40], nonce[40:56])
+        encryptor = aes.CTR256(temp[0:32], temp[32:48])
+
+        received.set_result(decryptor(nonce)[56:60])
+
+        while data := await reader.read(65536):
+            writer.write(encryptor(decryptor(data)))
+
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1], received
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("factory", [TCPAbridgedO, TCPIntermediateO])
+async def test_echo(factory):
+    server, port, received = await serve(factory.TAG)
+
+    protocol = factory(ipv6=False, proxy=None)
+    await protocol.connect(("127.0.0.1", port))
+
+    assert await received == factory.TAG
+
+    calls = []
+    encryptor = protocol.encryptor
+    protocol.encryptor = lambda data: calls.append(len(data)) or encryptor(data)
+
+    payloads = [os.urandom(4 * i) for i in range(1, 11)]
+    await asyncio.gather(*[protocol.send(p) for p in payloads])
+
+    # All the frames are encrypted together in one call
+    assert len(calls) == 1
+    assert [await protocol.recv() for _ in payloads] == payloads
+
+    # Large chunks are decrypted on the crypto worker
+    payload = os.urandom(512 * 1024)
+    await protocol.send(payload)
+
+    assert await protocol.recv() == payload
+    assert protocol.crypto_worker.stats()["tasks"] > 0
+
+    await protocol.close()
+    server.close()
+    await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_crypto_executor():
+    server, port, received = await serve(TCPAbridgedO.TAG)
+    executor = CryptoExecutor(2)
+
+    connection = Connection(
+        2, False, False, None,
+        protocol_factory=TCPAbridgedO,
+        addresses=[("127.0.0.1", port)],
+        crypto_executor=executor
+    )
+    await connection.connect()
+    await received
+
+    # The connection runs its crypto work on the executor it was given, not on the process-wide one
+    assert connection.protocol.crypto_worker in executor.workers
+
+    payload = os.urandom(512 * 1024)
+    await connection.send(payload)
+
+    assert await connection.recv() == payload
+    assert executor.stats()["tasks"] > 0
+
+    await connection.close()
+    executor.shutdown()
+    server.close()
+    await server.wait_closed()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("factory", [TCPAbridgedO, TCPIntermediateO])
+async def test_large_writes_offloaded(factory):
+    server, port, received = await serve(factory.TAG)
+
+    protocol = factory(ipv6=False, proxy=None)
+    await protocol.connect(("127.0.0.1", port))
+    await received
+
+    threads = []
+    encryptor = protocol.encryptor
+    protocol.encryptor = lambda data: threads.append(threading.current_thread()) or encryptor(data)
+
+    # A large frame followed right away by small ones: these wait for it, so the keystream stays in order
+    payloads = [os.urandom(512 * 1024), os.urandom(16), os.urandom(32), os.urandom(4)]
+
+    await asyncio.gather(*[protocol.send(p) for p in payloads])
+
+    assert [await protocol.recv() for _ in payloads] == payloads
+    assert len(threads) == 2
+    assert all(t is not threading.main_thread() for t in threads)
+
+    # Once the large ones are done, small frames are encrypted on the loop again
+    await protocol.send(payloads[1])
+
+    assert await protocol.recv() == payloads[1]
+    assert threads[-1] is threading.main_thread()
+
+    await protocol.close()
+    server.close()
+    await server.wait_closed()
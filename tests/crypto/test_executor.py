@@ -0,0 +1,64 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+
+import pytest
+
+from pyrogram.crypto.executor import CryptoExecutor
+
+
+@pytest.mark.asyncio
+async def test_pinned_worker_runs_in_order():
+    executor = CryptoExecutor(2)
+    worker = executor.pin()
+    loop = asyncio.get_running_loop()
+    order = []
+
+    await asyncio.gather(*[loop.run_in_executor(worker, order.append, i) for i in range(100)])
+
+    assert order == list(range(100))
+
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_stats():
+    executor = CryptoExecutor(2)
+    loop = asyncio.get_running_loop()
+
+    assert await loop.run_in_executor(executor, sum, [1, 2, 3]) == 6
+    assert executor.pin().run(sum, [1, 2]) == 3
+
+    stats = executor.stats()
+
+    assert stats["workers"] == 2
+    assert stats["tasks"] == 1
+    assert stats["inline_tasks"] == 1
+    assert stats["pending"] == 0
+    assert CryptoExecutor.process_stats()["tasks"] >= 1
+
+    executor.shutdown()
+
+
+def test_pin_spreads_workers():
+    executor = CryptoExecutor(3)
+
+    assert len({executor.pin() for _ in range(3)}) == 3
+
+    executor.shutdown()
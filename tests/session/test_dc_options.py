@@ -0,0 +1,139 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from pyrogram import raw
+from pyrogram.session.internals import DataCenter, DcOptions
+
+
+def make_options():
+    options = DcOptions()
+    options.update([
+        raw.types.DcOption(id=2, ip_address="149.154.167.50", port=443),
+        raw.types.DcOption(id=2, ip_address="149.154.167.51", port=443),
+        raw.types.DcOption(id=2, ip_address="149.154.167.151", port=443, media_only=True),
+        raw.types.DcOption(id=2, ip_address="2001:67c:4e8:f002::a", port=443, ipv6=True),
+        raw.types.DcOption(id=2, ip_address="149.154.167.52", port=443, tcpo_only=True),
+        raw.types.DcOption(id=2, ip_address="149.154.167.53", port=443, cdn=True),
+        raw.types.DcOption(id=4, ip_address="149.154.167.91", port=443),
+    ])
+    return options
+
+
+def test_update_skips_cdn_and_obfuscated_only():
+    assert len(make_options()) == 5
+
+
+def test_candidates():
+    options = make_options()
+
+    assert options.candidates(2, False, False, False) == [("149.154.167.50", 443), ("149.154.167.51", 443)]
+    assert options.candidates(2, False, False, True)[0] == ("149.154.167.151", 443)
+    assert options.candidates(2, False, True, False)[0] == ("2001:67c:4e8:f002::a", 443)
+
+
+def test_fallback_is_last_resort():
+    options = DcOptions()
+
+    assert options.candidates(4, False, False, False) == [DataCenter(4, False, False, False)]
+    assert make_options().candidates(5, False, False, False) == [DataCenter(5, False, False, False)]
+
+
+def test_fastest_first():
+    options = make_options()
+
+    options.report(("149.154.167.50", 443), None)
+    options.report(("149.154.167.51", 443), 0.2)
+
+    assert options.candidates(2, False, False, False) == [("149.154.167.51", 443), ("149.154.167.50", 443)]
+
+    options.report(("149.154.167.50", 443), 0.1)
+
+    assert options.candidates(2, False, False, False)[0] == ("149.154.167.50", 443)
+
+
+def test_failed_after_unmeasured():
+    options = DcOptions()
+    options.update([
+        raw.types.DcOption(id=2, ip_address="1.1.1.1", port=443),
+        raw.types.DcOption(id=2, ip_address="2.2.2.2", port=443),
+        raw.types.DcOption(id=2, ip_address="3.3.3.3", port=443),
+    ])
+
+    options.report(("1.1.1.1", 443), None)
+    options.report(("3.3.3.3", 443), 0.5)
+
+    assert options.candidates(2, False, False, False) == [
+        ("3.3.3.3", 443), ("2.2.2.2", 443), ("1.1.1.1", 443), DataCenter(2, False, False, False)
+    ]
+
+
+def test_latencies_survive_updates_and_reloads():
+    options = make_options()
+    options.report(("149.154.167.51", 443), 0.2)
+
+    options.update([
+        raw.types.DcOption(id=2, ip_address="149.154.167.50", port=443),
+        raw.types.DcOption(id=2, ip_address="149.154.167.51", port=443),
+    ])
+
+    reloaded = DcOptions()
+    reloaded.load(options.dump())
+
+    assert reloaded.loaded
+    assert reloaded.candidates(2, False, False, False)[0] == ("149.154.167.51", 443)
+
+
+def test_changed():
+    options = make_options()
+
+    assert options.changed
+
+    options.load(options.dump())
+
+    assert not options.changed
+
+    # The same config again is nothing worth saving
+    options.update(
+        [raw.types.DcOption(id=o[0], ip_address=o[1], port=o[2], ipv6=o[3], media_only=o[4]) for o in options.dump()]
+    )
+
+    assert not options.changed
+
+    # A first measurement is, but not a latency close to the known one
+    options.report(("149.154.167.50", 443), 0.2)
+
+    assert options.changed
+
+    options.changed = False
+    options.report(("149.154.167.50", 443), 0.22)
+
+    assert not options.changed
+
+    options.report(("149.154.167.50", 443), 0.5)
+
+    assert options.changed
+
+    options.changed = False
+    options.report(("149.154.167.50", 443), None)
+
+    assert options.changed
+
+    options.changed = False
+    options.update([raw.types.DcOption(id=2, ip_address="149.154.167.50", port=443)])
+
+    assert options.changed
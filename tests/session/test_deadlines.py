@@ -0,0 +1,91 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+
+import pytest
+
+from pyrogram.session.internals import Deadlines
+
+
+@pytest.mark.asyncio
+async def test_expire():
+    loop = asyncio.get_running_loop()
+    deadlines = Deadlines(loop, resolution=0.01)
+
+    slow = loop.create_future()
+    fast = loop.create_future()
+
+    deadlines.add(slow, 10)
+    deadlines.add(fast, 0.02)
+
+    assert await fast is None
+    assert not slow.done()
+
+    deadlines.clear()
+
+
+@pytest.mark.asyncio
+async def test_resolved_before_deadline():
+    loop = asyncio.get_running_loop()
+    deadlines = Deadlines(loop, resolution=0.01)
+
+    future = loop.create_future()
+    deadlines.add(future, 0.02)
+    future.set_result(1)
+
+    await asyncio.sleep(0.05)
+
+    assert future.result() == 1
+    assert len(deadlines) == 0
+    assert deadlines.timer is None
+
+
+@pytest.mark.asyncio
+async def test_batch():
+    loop = asyncio.get_running_loop()
+    deadlines = Deadlines(loop, resolution=0.05)
+
+    futures = [loop.create_future() for _ in range(100)]
+
+    for future in futures:
+        deadlines.add(future, 0.01)
+
+    await asyncio.gather(*futures)
+
+    assert len(deadlines) == 0
+
+
+@pytest.mark.asyncio
+async def test_clear():
+    loop = asyncio.get_running_loop()
+    deadlines = Deadlines(loop, resolution=0.01)
+
+    pending = loop.create_future()
+    resolved = loop.create_future()
+
+    deadlines.add(pending, 10)
+    deadlines.add(resolved, 10)
+    resolved.set_result(1)
+
+    deadlines.clear()
+
+    assert pending.result() is None
+    assert resolved.result() == 1
+    assert len(deadlines) == 0
+    assert deadlines.timer is None
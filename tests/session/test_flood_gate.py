@@ -0,0 +1,72 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import time
+
+import pytest
+
+from pyrogram.errors import FloodWait
+from pyrogram.session import FloodGate
+
+
+def test_close():
+    gate = FloodGate()
+    gate.close("messages.SendMessage", 1, 30)
+
+    assert gate.remaining("messages.SendMessage", 1) == pytest.approx(30, abs=0.1)
+    assert gate.remaining("messages.SendMessage", 2) == 0
+    assert gate.remaining("messages.SendMessage") == 0
+    assert list(gate.gated) == [("messages.SendMessage", 1)]
+
+
+def test_close_keeps_longest():
+    gate = FloodGate()
+    gate.close("messages.SendMessage", None, 30)
+    gate.close("messages.SendMessage", None, 10)
+
+    assert gate.remaining("messages.SendMessage") == pytest.approx(30, abs=0.1)
+
+
+def test_expired():
+    gate = FloodGate()
+    gate.close("messages.SendMessage", None, 0)
+
+    assert len(gate) == 0
+
+
+@pytest.mark.asyncio
+async def test_wait():
+    gate = FloodGate()
+    gate.close("messages.SendMessage", None, 0.1)
+
+    start = time.monotonic()
+    await asyncio.gather(*(gate.wait("messages.SendMessage") for _ in range(3)))
+
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_wait_above_threshold():
+    gate = FloodGate()
+    gate.close("messages.SendMessage", None, 60)
+
+    with pytest.raises(FloodWait) as e:
+        await gate.wait("messages.SendMessage", sleep_threshold=10)
+
+    assert e.value.value == 60
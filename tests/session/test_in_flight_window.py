@@ -0,0 +1,87 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+
+import pytest
+
+from pyrogram.session.internals import InFlightWindow
+
+
+@pytest.mark.asyncio
+async def test_limit():
+    window = InFlightWindow(2)
+
+    await window.acquire(1)
+    await window.acquire(1)
+
+    waiter = asyncio.ensure_future(window.acquire(1))
+    await asyncio.sleep(0)
+
+    assert not waiter.done()
+    assert window.waiting == 1
+
+    window.release()
+    await waiter
+
+    assert len(window) == 2
+
+
+@pytest.mark.asyncio
+async def test_priority():
+    window = InFlightWindow(1)
+    admitted = []
+
+    await window.acquire(1)
+
+    async def request(priority: int, name: str):
+        await window.acquire(priority)
+        admitted.append(name)
+        window.release()
+
+    tasks = [
+        asyncio.ensure_future(request(2, "bulk")),
+        asyncio.ensure_future(request(1, "normal")),
+        asyncio.ensure_future(request(0, "interactive"))
+    ]
+    await asyncio.sleep(0)
+
+    window.release()
+    await asyncio.gather(*tasks)
+
+    assert admitted == ["interactive", "normal", "bulk"]
+    assert len(window) == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter():
+    window = InFlightWindow(1)
+
+    await window.acquire(1)
+
+    waiter = asyncio.ensure_future(window.acquire(0))
+    await asyncio.sleep(0)
+    waiter.cancel()
+
+    window.release()
+
+    assert len(window) == 0
+
+    await window.acquire(1)
+
+    assert len(window) == 1
@@ -0,0 +1,78 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from pyrogram.session import Metrics
+from pyrogram.session.metrics import Histogram
+
+
+def test_histogram():
+    histogram = Histogram()
+
+    for value in (0.001, 0.02, 0.02, 0.3, 4):
+        histogram.observe(value)
+
+    assert histogram.count == 5
+    assert histogram.max == 4
+    assert histogram.percentile(50) == 0.025
+    assert histogram.percentile(100) == 4
+
+
+def test_callback():
+    events = []
+    metrics = Metrics(lambda *args: events.append(args))
+
+    metrics.observe_request("messages.SendMessage", 0.2)
+    metrics.observe_flood_wait("messages.SendMessage", 5)
+    metrics.count("retries", "messages.SendMessage")
+
+    assert events == [
+        ("latency", 0.2, "messages.SendMessage"),
+        ("flood_wait", 5, "messages.SendMessage"),
+        ("retries", 1, "messages.SendMessage")
+    ]
+    assert metrics.flood_wait_time == 5
+    assert metrics.retries == 1
+
+
+def test_merge():
+    a, b = Metrics(), Metrics()
+
+    a.observe_request("help.GetConfig", 0.1)
+    b.observe_request("help.GetConfig", 0.3)
+    b.observe_sent(100)
+    a.count("reconnects")
+
+    merged = Metrics.merge([a, b]).to_dict()
+
+    assert merged["requests"] == 2
+    assert merged["bytes_sent"] == 100
+    assert merged["reconnects"] == 1
+    assert merged["latency"]["help.GetConfig"]["count"] == 2
+
+
+def test_failing_callback(caplog):
+    def callback(*args):
+        raise ValueError("broken callback")
+
+    metrics = Metrics(callback)
+    metrics.observe_request("messages.SendMessage", 0.2)
+    metrics.observe_received(100)
+
+    assert metrics.requests == 1
+    assert metrics.bytes_received == 100
+    assert "broken callback" in caplog.text
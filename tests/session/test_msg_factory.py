@@ -0,0 +1,71 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+from io import BytesIO
+
+from pyrogram import raw
+from pyrogram.raw.core import TLObject
+from pyrogram.session.internals import MsgFactory
+
+
+def send_message(text: str):
+    return raw.functions.messages.SendMessage(
+        peer=raw.types.InputPeerSelf(),
+        message=text,
+        random_id=0
+    )
+
+
+def test_gzip():
+    factory = MsgFactory(gzip_threshold=512)
+    query = send_message("Hello " * 200)
+
+    message = factory(query)
+
+    assert message.length < len(query.write())
+    assert TLObject.read(BytesIO(message.write()[16:])).message == query.message
+    assert factory.gzip_packed_count == 1
+    assert factory.gzip_bytes_saved == len(query.write()) - message.length
+
+
+def test_gzip_not_worth():
+    factory = MsgFactory(gzip_threshold=512)
+    query = raw.functions.messages.SendEncrypted(
+        peer=raw.types.InputEncryptedChat(chat_id=0, access_hash=0),
+        random_id=0,
+        data=os.urandom(1024)
+    )
+
+    message = factory(query)
+
+    assert message.length == len(query.write())
+    assert factory.gzip_packed_count == 0
+
+
+def test_gzip_small():
+    factory = MsgFactory(gzip_threshold=512)
+
+    assert factory(send_message("Hello")).length == len(send_message("Hello").write())
+
+
+def test_gzip_disabled():
+    factory = MsgFactory()
+    query = send_message("Hello " * 200)
+
+    assert factory(query).length == len(query.write())
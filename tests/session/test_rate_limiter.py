@@ -0,0 +1,89 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from pyrogram import raw
+from pyrogram.session import RateLimiter
+from pyrogram.session.rate_limiter import TokenBucket
+
+
+def send_message(user_id: int):
+    return raw.functions.messages.SendMessage(
+        peer=raw.types.InputPeerUser(user_id=user_id, access_hash=0),
+        message="Hello",
+        random_id=0
+    )
+
+
+def test_bucket_burst():
+    bucket = TokenBucket(rate=10, burst=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+def test_bucket_flood_wait():
+    bucket = TokenBucket(rate=10, burst=3)
+    bucket.flood_wait(2)
+
+    assert bucket.rate == 5
+    assert bucket.reserve() == pytest.approx(2.2, abs=0.01)
+
+
+def test_peer_limits():
+    limiter = RateLimiter(limits={}, peer_limits={"messages.Send*": (1, 1)})
+
+    assert [b.reserve() for b in limiter.get_buckets(send_message(1))] == [0]
+    assert [b.reserve() for b in limiter.get_buckets(send_message(2))] == [0]
+    assert limiter.get_buckets(send_message(1))[0].reserve() == pytest.approx(1, abs=0.01)
+
+
+def test_shared_limits():
+    limiter = RateLimiter(limits={"messages.*": (1, 1)}, peer_limits={})
+
+    assert limiter.get_buckets(send_message(1)) == limiter.get_buckets(raw.functions.messages.GetDialogFilters())
+    assert limiter.get_buckets(raw.functions.help.GetConfig()) == []
+
+
+@pytest.mark.asyncio
+async def test_acquire():
+    limiter = RateLimiter(limits={"messages.SendMessage": (100, 1)}, peer_limits={})
+
+    await limiter.acquire(send_message(1))
+    await limiter.acquire(send_message(1))
+
+    assert limiter.buckets["messages.SendMessage"].tokens < 0.1
+
+
+def test_wrapped_queries():
+    limiter = RateLimiter(limits={"messages.SendMessage": (10, 1)}, peer_limits={"messages.Send*": (1, 1)})
+
+    # What Client.invoke acquires for, and what the session reports FloodWaits for, share the same buckets
+    wrapped = raw.functions.InvokeWithTakeout(
+        takeout_id=1,
+        query=raw.functions.InvokeWithBusinessConnection(connection_id="test", query=send_message(1))
+    )
+
+    assert limiter.get_buckets(wrapped) == limiter.get_buckets(send_message(1))
+    assert len(limiter.get_buckets(wrapped)) == 2
+
+    limiter.flood_wait(wrapped, 2)
+
+    assert limiter.buckets["messages.SendMessage"].rate == 5
@@ -0,0 +1,61 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from pyrogram.session.internals import ReplayWindow
+
+
+def test_membership():
+    window = ReplayWindow(4)
+
+    for msg_id in (8, 12, 16):
+        window.add(msg_id)
+
+    assert len(window) == 3
+    assert 12 in window
+    assert 20 not in window
+
+
+def test_lowest():
+    window = ReplayWindow(4)
+    window.add(100)
+    window.add(104)
+
+    assert window.lowest == 100
+
+
+def test_eviction():
+    window = ReplayWindow(2)
+
+    for msg_id in (100, 104, 108):
+        window.add(msg_id)
+
+    assert len(window) == 2
+    assert 100 not in window
+    assert 104 in window and 108 in window
+
+    # Replaying an evicted msg_id must still be detectable
+    assert window.lowest > 100
+
+
+def test_clear():
+    window = ReplayWindow(2)
+    window.add(100)
+    window.clear()
+
+    assert not window
+    assert window.lowest == 0
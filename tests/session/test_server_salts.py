@@ -0,0 +1,63 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import time
+
+from pyrogram.raw.core import FutureSalt, FutureSalts
+from pyrogram.session.internals import ServerSalts
+
+
+def test_current():
+    now = int(time.time())
+    salts = ServerSalts()
+    salts.load([(now + 1800, now + 5400, 2), (now - 1800, now + 1800, 1)])
+
+    assert salts.current() == 1
+    assert 5300 < salts.remaining() <= 5400
+
+
+def test_expired():
+    now = int(time.time())
+    salts = ServerSalts()
+    salts.load([(now - 3600, now - 1, 1), (now - 1, now + 3600, 2)])
+
+    assert salts.current() == 2
+    assert len(salts) == 1
+
+
+def test_update_server_time():
+    now = int(time.time())
+    salts = ServerSalts()
+
+    # The server clock is one hour ahead, only the second salt is valid there
+    salts.update(
+        FutureSalts(
+            req_msg_id=0,
+            now=now + 3600,
+            salts=[FutureSalt(now - 1800, now + 1800, 1), FutureSalt(now + 1800, now + 5400, 2)]
+        )
+    )
+
+    assert salts.current() == 2
+
+
+def test_empty():
+    salts = ServerSalts()
+
+    assert salts.current() is None
+    assert salts.remaining() == 0
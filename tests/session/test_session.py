@@ -0,0 +1,765 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import os
+from typing import List, Tuple
+
+import pytest
+
+import pyrogram
+from pyrogram import enums, raw
+from pyrogram.errors import FloodWait, Unauthorized
+from pyrogram.crypto import mtproto
+from pyrogram.raw.core import Message, MsgContainer
+from pyrogram.session import FloodGate, Session
+from pyrogram.session.internals import DcOptions, MsgId
+from pyrogram.storage import MemoryStorage
+
+
+class FakeConnection:
+    """Connection that records what is sent and only receives what the test puts in its queue."""
+
+    instances = []
+    # Number of the next connection attempts that fail
+    failures = 0
+
+    def __init__(self, **kwargs):
+        self.sent = []
+        self.queue = asyncio.Queue()
+        self.latencies = {}
+
+        FakeConnection.instances.append(self)
+
+    async def connect(self):
+        if FakeConnection.failures:
+            FakeConnection.failures -= 1
+            raise ConnectionError("Connection failed")
+
+    async def send(self, data):
+        self.sent.append(data)
+
+    async def recv(self):
+        return await self.queue.get()
+
+    async def close(self):
+        self.queue.put_nowait(None)
+
+
+class FakeClient:
+    name = "test"
+    ipv6 = False
+    proxy = None
+    protocol_factory = None
+    connection_factory = FakeConnection
+    crypto_executor = pyrogram.crypto_executor
+    gzip_requests = True
+    hedge_requests = False
+    warm_standby = False
+    rate_limiter = None
+    metrics_callback = None
+    disconnect_handler = None
+    init_connection_params = None
+    app_version = device_model = system_version = system_lang_code = lang_pack = lang_code = "test"
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.flood_gate = FloodGate()
+        self.dc_options = DcOptions()
+
+
+async def make_session(**kwargs) -> Session:
+    FakeConnection.instances = []
+    FakeConnection.failures = 0
+
+    storage = MemoryStorage("test")
+    await storage.open()
+    await storage.api_id(1)
+
+    client = FakeClient(storage)
+
+    for key, value in kwargs.items():
+        setattr(client, key, value)
+
+    session = Session(client, 2, os.urandom(256), False)
+    send_message = session.send_message
+
+    # Answer the requests the session needs to start, leave everything else unanswered
+    async def answer(message, *args):
+        await send_message(message, *args)
+
+        if isinstance(message.body, (raw.functions.Ping, raw.functions.InvokeWithLayer)):
+            future = session.results.get(message.msg_id)
+
+            if future is not None and not future.done():
+                future.set_result(True)
+
+    session.send_message = answer
+
+    return session
+
+
+@pytest.mark.asyncio
+async def test_restart_with_full_window(monkeypatch):
+    monkeypatch.setattr(Session, "MAX_IN_FLIGHT", 2)
+
+    session = await make_session()
+    await session.start()
+
+    # Requests stuck on a connection that is about to die fill the whole window
+    stuck = [asyncio.ensure_future(session.send(raw.functions.help.GetNearestDc())) for _ in range(2)]
+    await asyncio.sleep(0.1)
+
+    assert session.window.active == 2
+
+    # Ping and InitConnection don't wait for a slot, so the session comes back without waiting for those to time out
+    await asyncio.wait_for(session.restart(), 1)
+
+    assert session.is_started.is_set()
+    assert session.window.active == 2
+    assert len(FakeConnection.instances) == 2
+
+    for task in stuck:
+        task.cancel()
+
+    await asyncio.gather(*stuck, return_exceptions=True)
+    await session.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_after_unauthorized():
+    session = await make_session()
+    await session.start()
+
+    # Transport error 404: the auth key is unknown to the server
+    FakeConnection.instances[-1].queue.put_nowait((-404).to_bytes(4, "little", signed=True))
+    await asyncio.sleep(0.1)
+
+    with pytest.raises(Unauthorized):
+        await session.stop()
+
+    assert session.send_task is None
+    assert session.dispatch_task is None
+    assert session.updates_task is None
+    assert session.acks_timer is None
+    assert not session.decode_tasks
+
+
+@pytest.mark.asyncio
+async def test_updates_keep_order_without_waiting_for_differences():
+    session = await make_session()
+    client = session.client
+    loop = asyncio.get_running_loop()
+
+    dispatched = []
+    invoked = []
+
+    # The real Client.handle_updates, on top of a client whose difference requests take a while
+    async def invoke(query):
+        invoked.append(loop.time())
+        await asyncio.sleep(0.3)
+
+        return raw.types.updates.Difference(
+            new_messages=[], new_encrypted_messages=[], chats=[], users=[], state=None,
+            other_updates=[raw.types.UpdateDcOptions(dc_options=[query.pts])]
+        )
+
+    client.skip_updates = True
+    client.invoke = invoke
+    client.dispatcher = type("Dispatcher", (), {"updates_queue": type("Queue", (), {
+        "put_nowait": staticmethod(lambda item: dispatched.append(item[0]))
+    })})
+    client.handle_updates = pyrogram.Client.handle_updates.__get__(client)
+
+    for update in [
+        raw.types.UpdateShortMessage(id=1, user_id=1, message="", pts=11, pts_count=1, date=0),
+        raw.types.UpdateShortMessage(id=2, user_id=1, message="", pts=21, pts_count=1, date=0),
+        raw.types.UpdateShort(update=raw.types.UpdateDcOptions(dc_options=["a"]), date=0),
+        raw.types.UpdateShort(update=raw.types.UpdateDcOptions(dc_options=["b"]), date=0),
+    ]:
+        session.updates_queue.put_nowait(update)
+
+    session.updates_task = loop.create_task(session.updates_worker())
+    await asyncio.sleep(0.1)
+
+    # Both difference requests are in flight at once, nothing is dispatched ahead of the first one
+    assert len(invoked) == 2 and invoked[1] - invoked[0] < 0.1
+    assert dispatched == []
+    assert session.pending_updates == 4
+
+    await asyncio.sleep(0.4)
+
+    assert [u.dc_options[0] for u in dispatched] == [10, 20, "a", "b"]
+    assert session.pending_updates == 0
+
+    session.updates_task.cancel()
+    await asyncio.gather(session.updates_task, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_failing_metrics_callback():
+    def callback(*args):
+        raise ValueError("broken callback")
+
+    session = await make_session(metrics_callback=callback)
+    await asyncio.wait_for(session.start(), 1)
+
+    connection = FakeConnection.instances[-1]
+    connection.queue.put_nowait(os.urandom(64))
+    await asyncio.sleep(0.1)
+
+    assert not session.recv_task.done()
+    assert session.metrics.packets_received == 1
+
+    await session.stop()
+
+
+def queue_pings(session: Session, count: int):
+    messages = [session.msg_factory(raw.functions.Ping(ping_id=i)) for i in range(count)]
+    session.outgoing[enums.RequestPriority.NORMAL.value].extend((m, None) for m in messages)
+
+    return messages
+
+
+@pytest.mark.asyncio
+async def test_batch_message_cap():
+    session = await make_session()
+    messages = queue_pings(session, Session.MAX_CONTAINER_MESSAGES + 10)
+
+    first, second = session.next_batch(), session.next_batch()
+
+    assert [m for m, _ in first] == messages[:Session.MAX_CONTAINER_MESSAGES]
+    assert [m for m, _ in second] == messages[Session.MAX_CONTAINER_MESSAGES:]
+    assert session.next_batch() == []
+
+
+@pytest.mark.asyncio
+async def test_batch_length_cap(monkeypatch):
+    session = await make_session()
+    messages = queue_pings(session, 5)
+
+    # Room for two messages and their headers, but not for a third one
+    monkeypatch.setattr(Session, "MAX_CONTAINER_LENGTH", 3 * (messages[0].length + 16) - 1)
+
+    assert [m for m, _ in session.next_batch()] == messages[:2]
+    assert [m for m, _ in session.next_batch()] == messages[2:4]
+
+    # A message larger than the limit still goes out, alone
+    monkeypatch.setattr(Session, "MAX_CONTAINER_LENGTH", 1)
+
+    assert [m for m, _ in session.next_batch()] == messages[4:]
+
+
+@pytest.mark.asyncio
+async def test_container_notifications_fan_out(monkeypatch):
+    # Keep the salt worker quiet, so that only the requests below go out
+    monkeypatch.setattr(Session, "SALTS_REFRESH_THRESHOLD", 0)
+
+    session = await make_session()
+    await session.start()
+
+    tasks = [asyncio.ensure_future(session.send(raw.functions.help.GetNearestDc())) for _ in range(3)]
+    await asyncio.sleep(0.1)
+
+    # The three requests went out together in one container
+    (container_id, msg_ids), = [(k, v) for k, v in session.containers.items() if set(v) & set(session.requests)]
+    requests = [msg_id for msg_id in msg_ids if msg_id in session.requests]
+
+    assert len(requests) == 3
+
+    # An ack of the container acknowledges every message inside it
+    await session.handle_packet(
+        Message(raw.types.MsgsAck(msg_ids=[container_id]), MsgId(), 0, 0)
+    )
+
+    assert session.acked_requests >= set(requests)
+
+    # As does an error about the container: each request gets it
+    await session.handle_packet(
+        Message(
+            raw.types.BadMsgNotification(bad_msg_id=container_id, bad_msg_seqno=0, error_code=64),
+            MsgId(), 0, 0
+        )
+    )
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(r, raw.types.BadMsgNotification) for r in results)
+    assert container_id not in session.containers
+
+    await session.stop()
+
+
+@pytest.mark.asyncio
+async def test_resend_requests():
+    session = await make_session()
+
+    unacked = session.msg_factory(raw.functions.help.GetNearestDc())
+    acked = session.msg_factory(raw.functions.help.GetNearestDc())
+    old = Message(raw.functions.help.GetNearestDc(), MsgId() - ((Session.RESEND_MAX_AGE + 10) << 32), 1, 0)
+
+    for message in (unacked, acked, old):
+        session.requests[message.msg_id] = message
+
+    session.acked_requests.add(acked.msg_id)
+    session.resend_requests()
+
+    resent = [m for m, _ in session.outgoing[enums.RequestPriority.INTERACTIVE.value]]
+
+    # Unacked requests go out again as they were, only the answers of acked ones are asked for; old ones are dropped
+    assert len(resent) == 2
+    assert resent[0] is unacked
+    assert isinstance(resent[1].body, raw.types.MsgResendAnsReq)
+    assert resent[1].body.msg_ids == [acked.msg_id]
+    assert session.outgoing_event.is_set()
+
+
+async def start_with_standby(**kwargs) -> Session:
+    session = await make_session(warm_standby=True, **kwargs)
+    await session.start()
+
+    for _ in range(100):
+        if session.standby is not None:
+            break
+
+        await asyncio.sleep(0.01)
+
+    assert session.standby is FakeConnection.instances[1]
+
+    return session
+
+
+@pytest.mark.asyncio
+async def test_standby_promoted_when_connection_drops():
+    session = await start_with_standby()
+    primary, standby = FakeConnection.instances
+    request = asyncio.ensure_future(session.send(raw.functions.help.GetNearestDc()))
+    await asyncio.sleep(0.1)
+
+    # The receive worker sees the connection closing and switches over instead of restarting the session
+    sent = len(standby.sent)
+    primary.queue.put_nowait(None)
+    await asyncio.sleep(0.1)
+
+    assert session.connection is standby
+    assert session.metrics.switchovers == 1
+    assert len(FakeConnection.instances) == 3
+    assert session.standby is FakeConnection.instances[2]
+
+    # The request left without an answer went out again on the new connection
+    assert len(standby.sent) > sent
+    assert not request.done()
+
+    request.cancel()
+    await asyncio.gather(request, return_exceptions=True)
+    await session.stop()
+
+
+@pytest.mark.asyncio
+async def test_standby_promoted_when_ping_fails(monkeypatch):
+    monkeypatch.setattr(Session, "PING_INTERVAL", 0.05)
+
+    session = await start_with_standby()
+    primary, standby = FakeConnection.instances
+
+    async def send(data):
+        raise ConnectionResetError
+
+    # The ping worker is the one finding out that the connection is dead
+    primary.send = send
+    await asyncio.sleep(0.2)
+
+    assert session.connection is standby
+    assert session.metrics.switchovers == 1
+    assert session.is_started.is_set()
+
+    await session.stop()
+
+
+@pytest.mark.asyncio
+async def test_dc_options_saved_on_change():
+    session = await make_session()
+    client = session.client
+    client.dc_options.load([(2, "149.154.167.51", 443, False, False, None)])
+
+    saved = []
+    dc_options = client.storage.dc_options
+
+    async def save(value=object):
+        if value is not object:
+            saved.append(value)
+
+        return await dc_options(value)
+
+    client.storage.dc_options = save
+    connection = FakeConnection()
+
+    for latency in (0.1, 0.11, 0.1, 1.0):
+        connection.latencies = {("149.154.167.51", 443): latency}
+        await session.update_dc_options(connection)
+
+    # Only the first measurement and the big jump are worth writing down
+    assert [options[0][5] for options in saved] == [0.1, 1.0]
+
+
+@pytest.mark.asyncio
+async def test_stop_expires_pending_requests():
+    session = await make_session()
+    await session.start()
+
+    request = asyncio.ensure_future(session.send(raw.functions.help.GetNearestDc()))
+    await asyncio.sleep(0.1)
+
+    await session.stop()
+
+    # The request is not left waiting for the whole timeout on a session that is gone
+    await asyncio.sleep(0)
+
+    assert request.done()
+
+    with pytest.raises(TimeoutError, match="Request timed out"):
+        await request
+
+    assert len(session.deadlines) == 0
+
+
+@pytest.mark.asyncio
+async def test_restart_with_failed_attempt():
+    session = await make_session()
+    await session.start()
+
+    updates_task = session.updates_task
+    request = asyncio.ensure_future(session.send(raw.functions.help.GetNearestDc()))
+    await asyncio.sleep(0.1)
+
+    # The first reconnection attempt fails, the second one succeeds
+    FakeConnection.failures = 1
+    await asyncio.wait_for(session.restart(), 1)
+    await asyncio.sleep(0.1)
+
+    assert session.is_started.is_set()
+    assert len(FakeConnection.instances) == 3
+
+    # The request is still waiting for its answer and went out again on the new connection, updates kept flowing
+    assert not request.done()
+    assert len(session.deadlines) > 0
+    assert session.updates_task is updates_task
+    assert session.connection.sent
+
+    request.cancel()
+    await asyncio.gather(request, return_exceptions=True)
+    await session.stop()
+
+
+@pytest.mark.asyncio
+async def test_rtt_only_from_ping_worker():
+    session = await make_session()
+
+    # The pong of the connection check sent by start() is not a round trip sample
+    await session.handle_packet(Message(raw.types.Pong(msg_id=MsgId(), ping_id=0), MsgId(), 0, 0))
+
+    assert session.metrics.rtt.count == 0
+
+    session.ping_id = 1
+    session.ping_sent_at = session.loop.time() - 0.05
+
+    await session.handle_packet(Message(raw.types.Pong(msg_id=MsgId(), ping_id=1), MsgId(), 0, 0))
+
+    assert session.metrics.rtt.count == 1
+    assert 0.05 <= session.metrics.rtt.max < 1
+
+
+@pytest.mark.asyncio
+async def test_updates_tasks_capped(monkeypatch):
+    monkeypatch.setattr(Session, "MAX_UPDATES_TASKS", 2)
+
+    session = await make_session()
+    release = asyncio.Event()
+    handled = []
+
+    async def handle_updates(updates, previous):
+        await release.wait()
+        handled.append(updates)
+
+    session.client.handle_updates = handle_updates
+
+    for i in range(10):
+        session.updates_queue.put_nowait(i)
+
+    session.updates_task = asyncio.get_running_loop().create_task(session.updates_worker())
+    await asyncio.sleep(0.1)
+
+    # A burst doesn't turn into a task per batch, the rest waits in the queue
+    assert len(session.updates_tasks) == 2
+    assert session.updates_queue.qsize() == 8
+    assert session.pending_updates == 10
+
+    release.set()
+    await asyncio.sleep(0.1)
+
+    assert sorted(handled) == list(range(10))
+    assert session.pending_updates == 0
+
+    session.updates_task.cancel()
+    await asyncio.gather(session.updates_task, return_exceptions=True)
+
+
+def send_message_query():
+    return raw.functions.messages.SendMessage(
+        peer=raw.types.InputPeerUser(user_id=5, access_hash=0), message="test", random_id=1
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("query", [
+    send_message_query(),
+    raw.functions.InvokeWithBusinessConnection(connection_id="test", query=send_message_query()),
+    raw.functions.InvokeWithTakeout(takeout_id=1, query=raw.functions.InvokeWithoutUpdates(query=send_message_query())),
+])
+async def test_flood_wait_gates_wrapped_function(query):
+    session = await make_session()
+    session.is_started.set()
+
+    async def send(*args, **kwargs):
+        raise FloodWait(value=30)
+
+    session.send = send
+
+    with pytest.raises(FloodWait):
+        await session.invoke(query, sleep_threshold=0)
+
+    # The gate is the one of the wrapped function and peer, not of the wrapper
+    assert list(session.client.flood_gate.gated) == [("messages.SendMessage", 5)]
+
+
+async def start_hedging() -> Tuple[Session, List[Message]]:
+    session = await make_session(hedge_requests=True)
+    await session.start()
+
+    # Known latencies put the hedge delay at HEDGE_MIN_DELAY
+    session.hedge_latencies.extend([0.01] * Session.HEDGE_MIN_SAMPLES)
+
+    sent = []
+    send_message = session.send_message
+
+    async def record(message, *args):
+        sent.append(message)
+        await send_message(message, *args)
+
+    session.send_message = record
+
+    return session, sent
+
+
+def hedge_query():
+    return raw.functions.users.GetUsers(id=[raw.types.InputUserSelf()])
+
+
+def bodies(sent: List[Message], kind: type) -> List[Message]:
+    return [m for m in sent if isinstance(m.body, kind)]
+
+
+@pytest.mark.asyncio
+async def test_hedge_delay_ignores_other_requests():
+    session, sent = await start_hedging()
+
+    async def answer(query, result):
+        request = asyncio.ensure_future(session.send(query))
+        await asyncio.sleep(0.05)
+
+        session.results[bodies(sent, type(query))[-1].msg_id].set_result(result)
+        await request
+
+    # Slow requests of other functions (e.g.: file parts) don't count towards the delay
+    await answer(raw.functions.help.GetNearestDc(), raw.types.NearestDc(country="", this_dc=2, nearest_dc=2))
+
+    assert list(session.hedge_latencies) == [0.01] * Session.HEDGE_MIN_SAMPLES
+
+    await answer(hedge_query(), [1])
+
+    assert len(session.hedge_latencies) == Session.HEDGE_MIN_SAMPLES + 1
+
+    await session.stop()
+
+
+@pytest.mark.asyncio
+async def test_answer_before_hedge_delay():
+    session, sent = await start_hedging()
+    request = asyncio.ensure_future(session.send(hedge_query(), hedge=True))
+    await asyncio.sleep(0.05)
+
+    original, = bodies(sent, raw.functions.users.GetUsers)
+    session.results[original.msg_id].set_result([1])
+
+    assert await request == [1]
+
+    await asyncio.sleep(0.1)
+
+    assert len(bodies(sent, raw.functions.users.GetUsers)) == 1
+    assert bodies(sent, raw.functions.RpcDropAnswer) == []
+
+    await session.stop()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("winner", [0, 1])
+async def test_hedge_winner(winner):
+    session, sent = await start_hedging()
+    request = asyncio.ensure_future(session.send(hedge_query(), hedge=True))
+    await asyncio.sleep(0.2)
+
+    # No answer within the delay: the request went out once more
+    messages = bodies(sent, raw.functions.users.GetUsers)
+    assert len(messages) == 2
+
+    session.results[messages[winner].msg_id].set_result([winner])
+
+    assert await request == [winner]
+
+    await asyncio.sleep(0.05)
+
+    # The server is asked not to send the answer of the loser
+    drop, = bodies(sent, raw.functions.RpcDropAnswer)
+    assert drop.body.req_msg_id == messages[1 - winner].msg_id
+    assert not {m.msg_id for m in messages} & set(session.results)
+
+    await session.stop()
+
+
+@pytest.mark.asyncio
+async def test_hedge_one_side_timed_out():
+    session, sent = await start_hedging()
+    request = asyncio.ensure_future(session.send(hedge_query(), hedge=True))
+    await asyncio.sleep(0.2)
+
+    original, hedged = bodies(sent, raw.functions.users.GetUsers)
+
+    # The original request expires, the hedged one is still waited for and its answer is kept
+    session.results[original.msg_id].set_result(None)
+    await asyncio.sleep(0.05)
+
+    assert not request.done()
+
+    session.results[hedged.msg_id].set_result([1])
+
+    assert await request == [1]
+    assert bodies(sent, raw.functions.RpcDropAnswer) == []
+
+    await session.stop()
+
+
+async def start_recording(monkeypatch) -> Tuple[Session, List[Message]]:
+    monkeypatch.setattr(Session, "ACKS_FLUSH_DELAY", 0.2)
+    # Keep the salt worker quiet, so that only what the test sends goes out
+    monkeypatch.setattr(Session, "SALTS_REFRESH_THRESHOLD", 0)
+
+    session = await make_session()
+    await session.start()
+
+    packed = []
+    run_crypto = session.run_crypto
+
+    async def record(size, func, *args):
+        if func is mtproto.pack:
+            packed.append(args[0])
+
+        return await run_crypto(size, func, *args)
+
+    session.run_crypto = record
+
+    return session, packed
+
+
+async def receive_content_message(session: Session) -> int:
+    msg_id = MsgId()
+    await session.handle_packet(Message(raw.types.Pong(msg_id=0, ping_id=5), msg_id, 1, 0))
+
+    return msg_id
+
+
+def acked(messages: List[Message]) -> List[int]:
+    return [
+        msg_id
+        for message in messages
+        for m in (message.body.messages if isinstance(message.body, MsgContainer) else [message])
+        if isinstance(m.body, raw.types.MsgsAck)
+        for msg_id in m.body.msg_ids
+    ]
+
+
+@pytest.mark.asyncio
+async def test_acks_ride_along_with_requests(monkeypatch):
+    session, packed = await start_recording(monkeypatch)
+    msg_id = await receive_content_message(session)
+
+    request = asyncio.ensure_future(session.send(raw.functions.help.GetNearestDc()))
+    await asyncio.sleep(0.05)
+
+    # The ack goes out in the same container as the request, well before the flush delay
+    container, = packed
+    assert isinstance(container.body, MsgContainer)
+    assert acked(packed) == [msg_id]
+    assert not session.pending_acks
+
+    # Nothing is left for the flush timer to send
+    await asyncio.sleep(0.3)
+
+    assert len(packed) == 1
+
+    request.cancel()
+    await asyncio.gather(request, return_exceptions=True)
+    await session.stop()
+
+
+@pytest.mark.asyncio
+async def test_acks_flushed_on_their_own(monkeypatch):
+    session, packed = await start_recording(monkeypatch)
+    msg_id = await receive_content_message(session)
+
+    await asyncio.sleep(0.1)
+
+    assert packed == []
+
+    # With nothing else to send, the acks go out alone once the flush delay elapsed
+    await asyncio.sleep(0.2)
+
+    message, = packed
+    assert isinstance(message.body, raw.types.MsgsAck)
+    assert acked(packed) == [msg_id]
+
+    await session.stop()
+
+
+@pytest.mark.asyncio
+async def test_acks_kept_when_send_fails(monkeypatch):
+    session, packed = await start_recording(monkeypatch)
+    msg_id = await receive_content_message(session)
+
+    async def send(data):
+        raise ConnectionResetError
+
+    session.connection.send = send
+
+    with pytest.raises(OSError):
+        await session.send(raw.functions.help.GetNearestDc())
+
+    # The acks were in the failed container, they are sent again with the next message
+    assert acked(packed) == [msg_id]
+    assert session.pending_acks == {msg_id}
+
+    await session.stop()
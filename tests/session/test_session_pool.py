@@ -0,0 +1,96 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import os
+
+import pytest
+
+import pyrogram
+from pyrogram.session import Session, SessionPool
+from pyrogram.storage import MemoryStorage
+from .test_session import FakeClient
+
+
+class FakeSession:
+    """Session whose requests wait until the test releases them."""
+
+    def __init__(self):
+        self.queries = []
+        self.release = asyncio.Event()
+
+    async def invoke(self, query, *args, **kwargs):
+        self.queries.append(query)
+        await self.release.wait()
+
+        return query
+
+
+@pytest.mark.asyncio
+async def test_least_in_flight_routing():
+    first, second = FakeSession(), FakeSession()
+    pool = SessionPool([first, second])
+
+    # The first request blocks on the first session, the next ones go to the idle one
+    blocked = asyncio.ensure_future(pool.invoke("a"))
+    await asyncio.sleep(0)
+
+    second.release.set()
+
+    assert await pool.invoke("b") == "b"
+    assert await pool.invoke("c") == "c"
+    assert first.queries == ["a"]
+    assert second.queries == ["b", "c"]
+    assert pool.in_flight == {first: 1, second: 0}
+
+    first.release.set()
+
+    assert await blocked == "a"
+    assert pool.in_flight == {first: 0, second: 0}
+
+
+@pytest.mark.asyncio
+async def test_pool_shares_auth_key(monkeypatch):
+    started = []
+
+    async def start(self):
+        started.append(self)
+
+    monkeypatch.setattr(Session, "start", start)
+
+    storage = MemoryStorage("test")
+    await storage.open()
+    await storage.dc_id(2)
+    await storage.auth_key(os.urandom(256))
+    await storage.test_mode(False)
+
+    client = FakeClient(storage)
+    client.session_pool_size = 3
+    client.media_pool_size = 2
+
+    pool = await pyrogram.Client.start_session_pool(client, 2)
+
+    assert len(pool.sessions) == 3
+    assert started == pool.sessions
+    assert {s.auth_key for s in pool.sessions} == {await storage.auth_key()}
+    assert len({s.session_id for s in pool.sessions}) == 3
+
+    media_pool = await pyrogram.Client.start_session_pool(client, 2, is_media=True)
+
+    assert len(media_pool.sessions) == 2
+    assert all(s.is_media for s in media_pool.sessions)
@@ -0,0 +1,122 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import sqlite3
+
+import pytest
+
+from pyrogram.storage import FileStorage, MemoryStorage
+from pyrogram.storage.sqlite_storage import SQLiteStorage
+
+SALTS = [(1000, 2800, 1), (2800, 4600, 2)]
+DC_OPTIONS = [
+    (2, "149.154.167.51", 443, False, False, 0.05),
+    (2, "2001:67c:4e8:f002::a", 443, True, False, None),
+    (4, "149.154.167.92", 443, False, True, 10.0),
+]
+
+
+@pytest.mark.asyncio
+async def test_dc_auth_key():
+    storage = MemoryStorage("test")
+    await storage.open()
+
+    assert await storage.dc_auth_key(4) is None
+
+    await storage.dc_auth_key(4, b"\x01" * 256)
+    await storage.dc_auth_key(5, b"\x02" * 256)
+
+    assert await storage.dc_auth_key(4) == b"\x01" * 256
+
+    await storage.dc_auth_key(4, None)
+
+    assert await storage.dc_auth_key(4) is None
+    assert await storage.dc_auth_key(5) == b"\x02" * 256
+
+
+@pytest.mark.asyncio
+async def test_server_salts():
+    storage = MemoryStorage("test")
+    await storage.open()
+
+    await storage.server_salts(2, SALTS)
+    await storage.server_salts(4, SALTS[:1])
+
+    assert await storage.server_salts(2) == SALTS
+
+    # Saving replaces the salts of that DC only
+    await storage.server_salts(2, SALTS[1:])
+
+    assert await storage.server_salts(2) == SALTS[1:]
+    assert await storage.server_salts(4) == SALTS[:1]
+    assert await storage.server_salts(1) == []
+
+
+@pytest.mark.asyncio
+async def test_dc_options():
+    storage = MemoryStorage("test")
+    await storage.open()
+
+    assert await storage.dc_options() == []
+
+    await storage.dc_options(DC_OPTIONS)
+
+    assert await storage.dc_options() == DC_OPTIONS
+
+    await storage.dc_options(DC_OPTIONS[:1])
+
+    assert await storage.dc_options() == DC_OPTIONS[:1]
+
+
+@pytest.mark.asyncio
+async def test_file_storage_migration(tmp_path):
+    storage = FileStorage("test", tmp_path)
+    await storage.open()
+    await storage.dc_id(2)
+    await storage.auth_key(b"\x03" * 256)
+    await storage.close()
+
+    # Turn the session file back into what version 6 looked like
+    conn = sqlite3.connect(str(tmp_path / "test.session"))
+
+    with conn:
+        conn.executescript(
+            "DROP TABLE dc_auth_keys;"
+            "DROP TABLE server_salts;"
+            "DROP TABLE dc_options;"
+            "UPDATE version SET number = 6;"
+        )
+
+    conn.close()
+
+    storage = FileStorage("test", tmp_path)
+    await storage.open()
+
+    assert storage.version() == SQLiteStorage.VERSION
+    assert await storage.dc_id() == 2
+    assert await storage.auth_key() == b"\x03" * 256
+
+    await storage.dc_auth_key(4, b"\x01" * 256)
+    await storage.server_salts(2, SALTS)
+    await storage.dc_options(DC_OPTIONS)
+
+    assert await storage.dc_auth_key(4) == b"\x01" * 256
+    assert await storage.server_salts(2) == SALTS
+    assert await storage.dc_options() == DC_OPTIONS
+
+    await storage.close()
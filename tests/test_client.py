@@ -0,0 +1,114 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+
+import pytest
+
+import pyrogram
+from pyrogram import raw
+from pyrogram.errors import BadRequest
+
+
+@pytest.mark.asyncio
+async def test_terminate_cancels_background_tasks():
+    client = pyrogram.Client("test", api_id=1, api_hash="test", in_memory=True)
+    await client.storage.open()
+    client.is_initialized = True
+
+    # Stands in for a fire-and-forget request that never gets an answer
+    task = client.loop.create_task(asyncio.sleep(60))
+    client.background_tasks.add(task)
+    task.add_done_callback(client.background_tasks.discard)
+
+    await client.terminate()
+
+    assert task.cancelled()
+    assert not client.background_tasks
+
+
+class FakeSession:
+    def __init__(self, error=None):
+        self.error = error
+        self.queries = []
+
+    async def invoke(self, query, *args):
+        self.queries.append(query)
+        await asyncio.sleep(0.01)
+
+        if self.error is not None:
+            raise self.error
+
+        return raw.types.NearestDc(country="", this_dc=2, nearest_dc=2)
+
+
+async def make_client(session: FakeSession) -> pyrogram.Client:
+    client = pyrogram.Client("test", api_id=1, api_hash="test", in_memory=True)
+    await client.storage.open()
+    client.is_connected = True
+    client.session = session
+
+    return client
+
+
+@pytest.mark.asyncio
+async def test_fire_and_forget():
+    session = FakeSession()
+    client = await make_client(session)
+    query = raw.functions.help.GetNearestDc()
+
+    # The call returns right away, the request goes on in the background
+    assert await client.invoke(query, fire_and_forget=True) is None
+    assert len(client.background_tasks) == 1
+
+    await asyncio.gather(*client.background_tasks)
+
+    assert session.queries == [query]
+    assert not client.background_tasks
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("is_async", [False, True])
+async def test_fire_and_forget_error_callback(is_async):
+    error = BadRequest("test")
+    client = await make_client(FakeSession(error))
+    errors = []
+
+    if is_async:
+        async def callback(c, e):
+            errors.append((c, e))
+    else:
+        def callback(c, e):
+            errors.append((c, e))
+
+    assert await client.invoke(raw.functions.help.GetNearestDc(), fire_and_forget=True, error_callback=callback) is None
+    assert errors == []
+
+    await asyncio.gather(*client.background_tasks)
+
+    assert errors == [(client, error)]
+
+
+@pytest.mark.asyncio
+async def test_fire_and_forget_error_logged(caplog):
+    client = await make_client(FakeSession(BadRequest("test")))
+
+    await client.invoke(raw.functions.help.GetNearestDc(), fire_and_forget=True)
+    await asyncio.gather(*client.background_tasks)
+
+    assert "Fire-and-forget request failed" in caplog.text